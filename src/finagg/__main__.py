@@ -1,5 +1,6 @@
 """Main CLI entry points."""
 
+import contextlib
 import datetime
 import logging
 import multiprocessing as mp
@@ -10,7 +11,7 @@ from typing import Literal
 
 import click
 
-from . import bea, fred, sec, utils
+from . import bea, fred, ratelimit, sec, utils
 
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO
@@ -113,6 +114,17 @@ cli.add_command(sec._cli.entry_point, "sec")
         " hours to complete."
     ),
 )
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=False,
+    help=(
+        "Whether to only install SEC tags data filed after the most recent filing"
+        " date of each tag for each company that's already installed, and only"
+        " recompute SEC annual and quarterly data for companies with new filings."
+    ),
+)
 @click.option(
     "--processes",
     "-n",
@@ -133,6 +145,18 @@ cli.add_command(sec._cli.entry_point, "sec")
         "dropping and recreating them."
     ),
 )
+@click.option(
+    "--bulk-install",
+    "-b",
+    is_flag=True,
+    default=False,
+    help=(
+        "Whether to tune the database for installing large amounts of data while"
+        " installing (e.g., enabling write-ahead logging and relaxing durability for"
+        " SQLite databases, and deferring building indexes until the end)."
+        " Settings are restored after installing."
+    ),
+)
 @click.option(
     "--verbose",
     "-v",
@@ -149,8 +173,10 @@ def install(
     ticker: list[str] = [],
     ticker_set: None | Literal["sec"] = None,
     from_zip: bool = False,
+    incremental: bool = False,
     processes: int = mp.cpu_count() - 1,
     recreate_tables: bool = False,
+    bulk_install: bool = False,
     verbose: bool = False,
 ) -> None:
     if "FINAGG_ROOT_PATH" not in os.environ:
@@ -170,34 +196,53 @@ def install(
 
     start = time.monotonic()
 
-    all_skips = set(skip)
-    if "bea" not in all_skips:
-        ctx.invoke(bea._cli.install)
-
-    if "fred" not in all_skips:
-        ctx.invoke(
-            fred._cli.install,
-            all_=True,
-            series=series,
-            series_set=series_set,
-            recreate_tables=recreate_tables,
-            verbose=verbose,
-        )
-
-    if "sec" not in all_skips:
-        ctx.invoke(
-            sec._cli.install,
-            all_=True,
-            ticker=ticker,
-            ticker_set=ticker_set,
-            from_zip=from_zip,
-            processes=processes,
-            recreate_tables=recreate_tables,
-            verbose=verbose,
-        )
+    with contextlib.ExitStack() as stack:
+        if bulk_install:
+            tables = [*fred.sql.metadata.sorted_tables, *sec.sql.metadata.sorted_tables]
+            stack.enter_context(utils.bulk_install(tables=tables))
+
+        all_skips = set(skip)
+        if "bea" not in all_skips:
+            ctx.invoke(bea._cli.install)
+
+        if "fred" not in all_skips:
+            ctx.invoke(
+                fred._cli.install,
+                all_=True,
+                series=series,
+                series_set=series_set,
+                recreate_tables=recreate_tables,
+                verbose=verbose,
+            )
+
+        if "sec" not in all_skips:
+            ctx.invoke(
+                sec._cli.install,
+                all_=True,
+                ticker=ticker,
+                ticker_set=ticker_set,
+                from_zip=from_zip,
+                incremental=incremental,
+                processes=processes,
+                recreate_tables=recreate_tables,
+                verbose=verbose,
+            )
 
     td = datetime.timedelta(seconds=int(time.monotonic() - start))
     logger.info(f"Installation took {td}")
+    for name, stats in sorted(ratelimit.get_stats().items()):
+        if not stats.requests:
+            continue
+        utilization = ", ".join(
+            f"{limit.peak_utilization:.0%}" for limit in stats.limits
+        )
+        logger.info(
+            f"{name} made {stats.requests} requests ({stats.cached} cached, "
+            f"{stats.revalidated} revalidated, "
+            f"{stats.retries} retried) and was throttled for "
+            f"{stats.throttle_time:.2f} (s) with a peak rate limit "
+            f"utilization of {utilization}"
+        )
 
 
 def main() -> int:
@@ -42,23 +42,22 @@ from typing import Any, ClassVar, Literal, Sequence
 
 import pandas as pd
 import requests
-import requests_cache
 
-from .. import config, ratelimit
+from .. import config, ratelimit, utils
 
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO
 )
 logger = logging.getLogger(__name__)
 
-if config.disable_http_cache:
-    session = requests.Session()
-else:
-    session = requests_cache.CachedSession(
-        str(config.http_cache_path),
-        ignored_parameters=["ResultFormat"],
-        expire_after=timedelta(days=1),
-    )
+session = utils.make_session(
+    ignored_parameters=["ResultFormat"],
+    expire_after=timedelta(days=1),
+)
+"""Cachable session used for API requests.
+
+:meta hide-value:
+"""
 
 _YEAR = int | str
 
@@ -524,6 +523,7 @@ def _get_parameter_values(
         ratelimit.ErrorLimit(20, timedelta(minutes=1)),
         ratelimit.SizeLimit(90e6, timedelta(minutes=1)),
     ],
+    shared=__name__ if config.shared_rate_limits else None,
 )
 def _guarded_get(url: str, params: dict[str, Any], /) -> requests.Response:
     """Guarded version of `session.get`."""
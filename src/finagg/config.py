@@ -12,9 +12,17 @@ Environment variables assigned in the ``.env`` file are loaded on the
 
 import os
 import pathlib
+from datetime import time, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import create_engine
 
+_eastern: tzinfo
+try:
+    _eastern = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    _eastern = timezone(timedelta(hours=-5))
+
 root_path = pathlib.Path(os.environ.get("FINAGG_ROOT_PATH", pathlib.Path.cwd()))
 """Parent directory of the ``findata`` directory where the backend database
 and API cache file will be stored (unless otherwise configured according
@@ -46,6 +54,132 @@ extension. All API implementations share the same cache backend.
 :meta hide-value:
 """
 
+http_cache_backend = os.environ.get("FINAGG_HTTP_CACHE_BACKEND", "sqlite").lower()
+"""HTTP requests cache backend. One of ``"sqlite"`` (a single SQLite file at
+:data:`http_cache_path`), ``"filesystem"`` (one file per response within the
+:data:`http_cache_path` directory), or ``"memory"`` (a non-persistent,
+in-process cache). This can be set with the ``FINAGG_HTTP_CACHE_BACKEND``
+environment variable.
+
+:meta hide-value:
+"""
+
+http_cache_max_size = int(os.environ.get("FINAGG_HTTP_CACHE_MAX_SIZE", 0))
+"""Maximum size of all cached HTTP responses (in megabytes). Least recently
+used responses are evicted from the cache once this size is exceeded. A
+value of ``0`` means the cache size is unbounded. This can be set with the
+``FINAGG_HTTP_CACHE_MAX_SIZE`` environment variable.
+
+:meta hide-value:
+"""
+
+http_cache_expire_after: dict[str, timedelta | time] = {
+    "data.sec.gov/api/xbrl": time(3, tzinfo=_eastern),
+    "www.sec.gov/Archives/edgar/daily-index": time(3, tzinfo=_eastern),
+    "data.sec.gov/submissions": timedelta(days=1),
+    "www.sec.gov/files/company_tickers": timedelta(days=1),
+    "api.stlouisfed.org/fred/series/observations": time(8, 30, tzinfo=_eastern),
+    "api.stlouisfed.org/fred/release": time(8, 30, tzinfo=_eastern),
+    "api.stlouisfed.org/fred": timedelta(weeks=1),
+    "apps.bea.gov/api": timedelta(weeks=4),
+}
+"""HTTP cache expiration rules for API URLs. Maps URL glob patterns (without
+the protocol) to how long responses from matching URLs are cached. Values
+are either a duration (:class:`datetime.timedelta`) or a timezone-aware
+time of day (:class:`datetime.time`) at which matching responses expire
+(e.g., when an API refreshes its data each day). The first matching pattern
+is used. Responses from URLs that don't match any pattern use their API's
+default expiration. Modify this mapping in-place to change expiration rules
+at runtime.
+
+FRED observation and release responses expire at a fixed daily
+8:30 AM ET cutoff (when most FRED releases are published) rather than at
+each series' next scheduled release. Deriving the next release from FRED's
+release calendar would spend extra API requests per series, so responses may
+be refreshed more often than their data changes.
+
+:meta hide-value:
+"""
+
+http_pool_size = int(os.environ.get("FINAGG_HTTP_POOL_SIZE", 16))
+"""Maximum number of keep-alive connections to reuse per API host. Should be
+at least the number of threads making concurrent requests to a host. This can
+be set with the ``FINAGG_HTTP_POOL_SIZE`` environment variable.
+
+:meta hide-value:
+"""
+
+shared_rate_limits = os.environ.get("FINAGG_SHARED_RATE_LIMITS", "false").lower() in {
+    "1",
+    "true",
+}
+"""Whether to share API rate limits between all processes on the same host.
+Useful when running multiple :mod:`finagg` jobs or workers at once so they
+cooperatively respect a single rate limit per API rather than each process
+assuming it has the full rate limit to itself. This can be set with the
+``FINAGG_SHARED_RATE_LIMITS`` environment variable.
+
+:meta hide-value:
+"""
+
+rate_limit_path = pathlib.Path(
+    os.environ.get(
+        "FINAGG_RATE_LIMIT_PATH", root_path / "findata" / "rate_limits.sqlite"
+    )
+)
+"""Path to the SQLite file that stores shared rate limit states when
+:data:`shared_rate_limits` is enabled. This can be set with the
+``FINAGG_RATE_LIMIT_PATH`` environment variable and should include a file
+extension.
+
+:meta hide-value:
+"""
+
+bulk_insert_batch_size = int(os.environ.get("FINAGG_BULK_INSERT_BATCH_SIZE", 100_000))
+"""Maximum number of rows written per transaction by
+:func:`finagg.utils.bulk_insert` (used by all raw and refined feature
+writers). This can be set with the ``FINAGG_BULK_INSERT_BATCH_SIZE``
+environment variable.
+
+:meta hide-value:
+"""
+
+sqlite_bulk_install_pragmas: dict[str, int | str] = {
+    "synchronous": "NORMAL",
+    "cache_size": -262_144,
+    "mmap_size": 1 << 30,
+    "temp_store": "MEMORY",
+}
+"""SQLite pragmas set on all new database connections within
+:func:`finagg.utils.bulk_install` (in addition to enabling write-ahead
+logging). By default, transactions aren't synced to disk on every commit, a
+256MB page cache and a 1GB memory map are used, and temporary tables and
+indexes are kept in memory.
+
+:meta hide-value:
+"""
+
+zip_mmap = os.environ.get("FINAGG_ZIP_MMAP", "false").lower() in {"1", "true"}
+"""Whether background processes installing data from SEC bulk data zip files
+read the zip files through a read-only memory map rather than through regular
+file reads. All processes then decompress files directly from the same
+page-cached mapping of the zip file, reducing system calls and duplicate
+buffers. This can be set with the ``FINAGG_ZIP_MMAP`` environment variable.
+
+:meta hide-value:
+"""
+
+zip_stream = os.environ.get("FINAGG_ZIP_STREAM", "false").lower() in {"1", "true"}
+"""Whether background processes installing data from the SEC company facts zip
+file decode each company's facts incrementally (one tag at a time) rather
+than decoding the whole file at once. This bounds each process's peak memory
+usage by the size of the largest tag rather than the size of the largest
+filer, but decoding is slower. This can be set with the ``FINAGG_ZIP_STREAM``
+environment variable.
+
+:meta hide-value:
+"""
+
 database_path = root_path / "findata" / "finagg.sqlite"
 """Default path to the database file. The ``FINAGG_DATABASE_URL`` environment
 variable will take precedence over this value.
@@ -9,6 +9,7 @@ import click
 from .. import utils
 from . import api as _api
 from . import feat as _feat
+from . import sql as _sql
 
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO
@@ -153,6 +154,9 @@ def install(
 
     if "series" in all_raw:
         total_rows += _feat.series.install(all_series, recreate_tables=recreate_tables)
+        # Raw tables are indexed before refined features are installed from
+        # them, even if their indexes are deferred by a bulk install.
+        utils.create_indexes([_sql.series], deferred=True)
 
     all_refined = set()
     if all_:
@@ -164,6 +168,12 @@ def install(
         total_rows += _feat.economic.install(recreate_tables=recreate_tables)
 
     if all_ or all_refined or all_raw:
+        # Databases created before indexes were declared are migrated
+        # after installing so indexes are built once. Indexes deferred by a
+        # bulk install are created when the bulk install ends instead.
+        indexes = utils.create_indexes(_sql.metadata.sorted_tables)
+        if indexes:
+            logger.info(f"{indexes} missing indexes created for {__package__}")
         if total_rows:
             logger.info(f"{total_rows} total rows inserted for {__package__}")
         else:
@@ -8,18 +8,24 @@ from typing import Any, ClassVar
 
 import pandas as pd
 import requests
-import requests_cache
 
-from ... import config, ratelimit
+from ... import config, ratelimit, utils
 
-if config.disable_http_cache:
-    session = requests.Session()
-else:
-    session = requests_cache.CachedSession(
-        str(config.http_cache_path),
-        ignored_parameters=["api_key", "file_type"],
-        expire_after=timedelta(weeks=1),
-    )
+session = utils.make_session(
+    ignored_parameters=["api_key", "file_type"],
+    expire_after=timedelta(weeks=1),
+)
+"""Cachable session used for API requests.
+
+:meta hide-value:
+"""
+
+uncached_session = utils.make_session(cache=False)
+"""Uncached session used for API requests that shouldn't be cached. Shares the
+same connection pooling configuration as :data:`session`.
+
+:meta hide-value:
+"""
 
 
 class API(ABC):
@@ -34,7 +40,11 @@ class API(ABC):
         """Main dataset API method."""
 
 
-@ratelimit.guard([ratelimit.RequestLimit(120, timedelta(minutes=1))])
+@ratelimit.guard(
+    [ratelimit.RequestLimit(120, timedelta(minutes=1))],
+    retries=3,
+    shared=__name__ if config.shared_rate_limits else None,
+)
 def get(url: str, /, **kwargs: Any) -> requests.Response:
     """Main API get function used by all `Dataset.get` methods.
 
@@ -52,7 +62,7 @@ def get(url: str, /, **kwargs: Any) -> requests.Response:
     if params.pop("cache", True):
         response = session.get(url, params=params)
     else:
-        response = requests.get(url, params=params)
+        response = uncached_session.get(url, params=params)
     response.raise_for_status()
     return response
 
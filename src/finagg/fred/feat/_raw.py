@@ -177,6 +177,9 @@ class Series:
     def to_raw(cls, df: pd.DataFrame, /, *, engine: None | Engine = None) -> int:
         """Write the given dataframe to the raw feature table.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             df: Dataframe to store as rows in a local SQL table
             engine: Feature store database engine. Defaults to the engine
@@ -189,6 +192,4 @@ class Series:
         engine = engine or config.engine
         if not sa.inspect(engine).has_table(sql.series.name):
             sql.series.create(engine)
-        with engine.begin() as conn:
-            conn.execute(sql.series.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df)
+        return utils.bulk_insert(sql.series, df, engine=engine, upsert=True)
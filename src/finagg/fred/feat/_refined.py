@@ -266,6 +266,9 @@ class Economic:
     ) -> int:
         """Write the dataframe to the feature store.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             df: Dataframe to store completely as rows in a local SQL
                 table.
@@ -280,6 +283,4 @@ class Economic:
         if not sa.inspect(engine).has_table(sql.economic.name):
             sql.economic.create(engine)
         df = df.reset_index("date")
-        with engine.begin() as conn:
-            conn.execute(sql.economic.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df.index)
+        return utils.bulk_insert(sql.economic, df, engine=engine, upsert=True)
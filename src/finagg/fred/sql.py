@@ -33,6 +33,7 @@ series = sa.Table(
         sa.Float,
         doc="Economic series value for a particular date.",
     ),
+    sa.Index("ix_fred_raw_series_series_id_date", "series_id", "date"),
 )
 """SQL table for storing raw data as managed by
 :data:`finagg.fred.feat.series` (an alias for
@@ -5,18 +5,94 @@ respecting 3rd party API rate limits to avoid server-side throttling.
 
 """
 
+import asyncio
+import os
+import pathlib
+import pickle
+import random
+import sqlite3
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from collections import deque
-from dataclasses import dataclass
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from functools import update_wrapper
-from typing import Callable, Generic, ParamSpec, Sequence
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generator,
+    Generic,
+    Iterable,
+    ParamSpec,
+    Sequence,
+    TypeVar,
+)
 
 import requests
 
+from . import config
+
 _P = ParamSpec("_P")
 
+_T = TypeVar("_T")
+
+_R = TypeVar("_R")
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+"""Response status codes that guards retry requests for (if retries are
+enabled). These status codes usually indicate the server is throttling
+requests or is temporarily unavailable. ``403`` responses are also retried
+if they include a ``Retry-After`` header (some servers, such as SEC EDGAR,
+respond with ``403`` both when throttling requests and for permanent errors
+like missing user agents).
+
+:meta hide-value:
+"""
+
+
+@dataclass
+class LimitStats:
+    """Telemetry collected by a rate limit."""
+
+    #: Total contribution of all responses towards the rate limit (e.g.,
+    #: number of requests for :class:`RequestLimit`, number of errors for
+    #: :class:`ErrorLimit`, number of bytes for :class:`SizeLimit`, etc.).
+    total: float = 0.0
+
+    #: Peak fraction of the rate limit used within a period.
+    peak_utilization: float = 0.0
+
+
+@dataclass
+class GuardStats:
+    """Telemetry collected by a rate limit guard."""
+
+    #: Number of requests made by the underlying getter (including retries).
+    requests: int = 0
+
+    #: Number of responses that were retrieved from a cache without
+    #: contacting the server.
+    cached: int = 0
+
+    #: Number of cached responses that were revalidated with the server
+    #: (i.e., the server responded with "304 Not Modified").
+    revalidated: int = 0
+
+    #: Number of requests that were retried.
+    retries: int = 0
+
+    #: Cumulative time spent waiting to respect rate limits (in seconds).
+    throttle_time: float = 0.0
+
+    #: Telemetry collected by each of the guard's rate limits.
+    limits: list[LimitStats] = field(default_factory=list)
+
 
 @dataclass
 class _RateLimitData:
@@ -48,6 +124,9 @@ class RateLimit(ABC):
     You can create a custom rate-limiter by inheriting from this class
     and implementing a custom :meth:`eval` method.
 
+    Rate limits are thread-safe. A rate limit's state is only ever updated
+    while holding the rate limit's lock.
+
     Args:
         limit: Max limit within ``period`` (e.g., max number of
             requests, errors, size in memory, etc.).
@@ -72,6 +151,13 @@ class RateLimit(ABC):
     #: and the total wait time.
     _running_totals: _RunningTotals
 
+    #: Lock held while reading or updating the rate limit's state.
+    _lock: threading.RLock
+
+    #: Telemetry collected by the rate limit. Telemetry is local to the
+    #: current process.
+    stats: LimitStats
+
     #: Max quantity allowed within ``period``. The quantity type being limited
     #: is dependent on what's returned by :meth:`eval`.
     limit: float
@@ -88,6 +174,51 @@ class RateLimit(ABC):
         )
         self._rate_limit_datas = deque()
         self._running_totals = _RunningTotals()
+        self._lock = threading.RLock()
+        self.stats = LimitStats()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _get_state(self) -> dict[str, Any]:
+        """Get the rate limit's mutable state (i.e., everything that's updated
+        as responses are observed). Used for sharing rate limits between
+        processes.
+
+        """
+        return {
+            "rate_limit_datas": self._rate_limit_datas,
+            "running_totals": self._running_totals,
+        }
+
+    def _set_state(self, state: dict[str, Any], /) -> None:
+        """Set the rate limit's mutable state from a state returned by
+        :meth:`_get_state`.
+
+        """
+        self._rate_limit_datas = state["rate_limit_datas"]
+        self._running_totals = state["running_totals"]
+
+    def _reserve(self) -> float:
+        """Reserve capacity for a request before the request is made.
+
+        Most rate limits can only evaluate a request's contribution to
+        a limit after receiving the request's response, so this is a no-op
+        by default. Rate limits that can account for requests beforehand
+        (e.g., :class:`GCRARequestLimit`) override this method.
+
+        Returns:
+            Estimated time to wait before making the request to avoid
+            being throttled.
+
+        """
+        return 0.0
 
     @property
     def _ts(self) -> float:
@@ -116,49 +247,56 @@ class RateLimit(ABC):
             Estimated time to wait to avoid being throttled.
 
         """
-        # Get the timestamp and timedelta associated with this response.
-        ts = time.perf_counter()
-        dt = max(ts - self._ts, 0.0)
-
-        # Get the limit contribution value and wait time from the response.
-        v = self.eval(response)
-        if not isinstance(v, dict):
-            v = {"limit": v}
-        if "wait" not in v:
-            v["wait"] = 0.0
-        quantity = v["limit"]
-        wait = v["wait"]
-
-        # Create the new rate limit data.
-        new = _RateLimitData(ts, quantity)
-        self._rate_limit_datas.append(new)
-
-        # Update running totals for estimating wait times.
-        self._running_totals.quantity += quantity
-        self._running_totals.wait = max(self._running_totals.wait - dt, 0.0)
-        self._running_totals.wait = max(self._running_totals.wait, wait)
-
-        # Remove timed-out responses and remove their contributions
-        # to the total limit.
-        while self._rate_limit_datas and (
-            (self._rate_limit_datas[-1].ts - self._rate_limit_datas[0].ts)
-            >= self.period
-        ):
-            old = self._rate_limit_datas.popleft()
-            self._running_totals.quantity -= old.quantity
-
-        # Update total wait time according to the max limit.
-        tmp_limit = self._running_totals.quantity
-        tmp_wait = 0.0
-        if self._running_totals.quantity >= self.limit:
-            for r in self._rate_limit_datas:
-                tmp_wait = self.period - (self._ts - r.ts)
-                tmp_limit -= r.quantity
-                if tmp_limit < self.limit:
-                    break
-
-        self._running_totals.wait = max(self._running_totals.wait, tmp_wait)
-        return self._running_totals.wait
+        with self._lock:
+            # Get the timestamp and timedelta associated with this response.
+            ts = time.perf_counter()
+            dt = max(ts - self._ts, 0.0)
+
+            # Get the limit contribution value and wait time from the response.
+            v = self.eval(response)
+            if not isinstance(v, dict):
+                v = {"limit": v}
+            if "wait" not in v:
+                v["wait"] = 0.0
+            quantity = v["limit"]
+            wait = v["wait"]
+
+            # Create the new rate limit data.
+            new = _RateLimitData(ts, quantity)
+            self._rate_limit_datas.append(new)
+
+            # Update running totals for estimating wait times.
+            self.stats.total += quantity
+            self._running_totals.quantity += quantity
+            self._running_totals.wait = max(self._running_totals.wait - dt, 0.0)
+            self._running_totals.wait = max(self._running_totals.wait, wait)
+
+            # Remove timed-out responses and remove their contributions
+            # to the total limit.
+            while self._rate_limit_datas and (
+                (self._rate_limit_datas[-1].ts - self._rate_limit_datas[0].ts)
+                >= self.period
+            ):
+                old = self._rate_limit_datas.popleft()
+                self._running_totals.quantity -= old.quantity
+
+            self.stats.peak_utilization = max(
+                self.stats.peak_utilization,
+                self._running_totals.quantity / self.limit,
+            )
+
+            # Update total wait time according to the max limit.
+            tmp_limit = self._running_totals.quantity
+            tmp_wait = 0.0
+            if self._running_totals.quantity >= self.limit:
+                for r in self._rate_limit_datas:
+                    tmp_wait = self.period - (self._ts - r.ts)
+                    tmp_limit -= r.quantity
+                    if tmp_limit < self.limit:
+                        break
+
+            self._running_totals.wait = max(self._running_totals.wait, tmp_wait)
+            return self._running_totals.wait
 
     @abstractmethod
     def eval(self, response: requests.Response, /) -> float | dict[str, float]:
@@ -188,7 +326,7 @@ class RequestLimit(RateLimit):
     """Limit the number of requests made by the underlying getter."""
 
     def eval(self, response: requests.Response, /) -> float | dict[str, float]:
-        if hasattr(response, "from_cache") and response.from_cache:
+        if _from_cache(response):
             return 0.0
         return float(1)
 
@@ -197,7 +335,7 @@ class ErrorLimit(RateLimit):
     """Limit the number of errors occurred when using the underlying getter."""
 
     def eval(self, response: requests.Response, /) -> float | dict[str, float]:
-        if hasattr(response, "from_cache") and response.from_cache:
+        if _from_cache(response):
             return 0.0
         return float(response.status_code != 200)
 
@@ -206,18 +344,318 @@ class SizeLimit(RateLimit):
     """Limit the size of responses when using the underlying getter."""
 
     def eval(self, response: requests.Response, /) -> float | dict[str, float]:
-        if hasattr(response, "from_cache") and response.from_cache:
+        # Revalidated responses count as requests, but their content is
+        # still read from the cache.
+        if _from_cache(response) or getattr(response, "revalidated", False):
             return 0.0
         return float(len(response.content))
 
 
+class GCRARequestLimit(RateLimit):
+    """Limit the number of requests made by the underlying getter by
+    reserving capacity before each request is made.
+
+    Unlike :class:`RequestLimit`, which only throttles after a response is
+    received, this rate limit uses the generic cell rate algorithm (GCRA) to
+    space requests at least ``period / limit`` apart (allowing bursts of up to
+    ``burst`` requests) before they're sent. Bursts never exceed ``limit``
+    requests (plus ``burst - 1``) within any ``period``, and each request only
+    requires constant-time bookkeeping. Reservations for responses that don't
+    contribute to the limit (e.g., cached responses) are refunded.
+
+    Args:
+        limit: Max number of requests within ``period``.
+        period: Time interval for evaluating ``limit``.
+        buffer: Reduce ``limit`` by this fraction.
+        burst: Max number of requests that can be made back-to-back
+            without being spaced apart.
+
+    """
+
+    #: Max number of requests that can be made back-to-back.
+    burst: int
+
+    #: Minimum time between requests (in seconds).
+    interval: float
+
+    #: Theoretical arrival time of the next request.
+    _tat: float
+
+    def __init__(
+        self,
+        limit: float,
+        period: float | timedelta,
+        /,
+        *,
+        buffer: float = 0.0,
+        burst: int = 1,
+    ) -> None:
+        super().__init__(limit, period, buffer=buffer)
+        self.burst = burst
+        self.interval = self.period / self.limit
+        self._tat = 0.0
+
+    def _get_state(self) -> dict[str, Any]:
+        return {"tat": self._tat}
+
+    def _set_state(self, state: dict[str, Any], /) -> None:
+        self._tat = state["tat"]
+
+    def _reserve(self) -> float:
+        with self._lock:
+            ts = time.perf_counter()
+            tat = max(self._tat, ts)
+            wait = max(tat - (self.burst - 1) * self.interval - ts, 0.0)
+            self._tat = tat + self.interval
+            self.stats.peak_utilization = max(
+                self.stats.peak_utilization, (self._tat - ts) / self.period
+            )
+        return wait
+
+    def _update(self, response: requests.Response, /) -> float:
+        v = self.eval(response)
+        if not isinstance(v, dict):
+            v = {"limit": v}
+        with self._lock:
+            # Refund the unused portion of the request's reservation.
+            self._tat -= (1.0 - v["limit"]) * self.interval
+            self.stats.total += v["limit"]
+        return v.get("wait", 0.0)
+
+    def eval(self, response: requests.Response, /) -> float | dict[str, float]:
+        if _from_cache(response):
+            return 0.0
+        return float(1)
+
+
+class AdaptiveRequestLimit(GCRARequestLimit):
+    """A :class:`GCRARequestLimit` that adapts its limit according to server
+    pushback.
+
+    The limit is decreased multiplicatively whenever the server responds with
+    one of the ``pushback`` status codes, and then increased additively with
+    each successful response until it reaches its original value (i.e.,
+    additive-increase/multiplicative-decrease). The server's ``Retry-After``
+    header is respected whenever it's provided.
+
+    Args:
+        limit: Max number of requests within ``period``.
+        period: Time interval for evaluating ``limit``.
+        buffer: Reduce ``limit`` by this fraction.
+        burst: Max number of requests that can be made back-to-back
+            without being spaced apart.
+        backoff: Factor to multiply the limit by on server pushback.
+        recovery: Fraction of the max limit to increase the limit by
+            after each successful response. Also the fraction of the max
+            limit that the limit will never go below.
+        pushback: Response status codes that indicate the server is
+            throttling requests. ``403`` responses with a ``Retry-After``
+            header always indicate the server is throttling requests.
+
+    """
+
+    #: Factor to multiply the limit by on server pushback.
+    backoff: float
+
+    #: Max number of requests within ``period``. The limit will never
+    #: exceed this value.
+    max_limit: float
+
+    #: Response status codes that indicate the server is throttling requests.
+    pushback: frozenset[int]
+
+    #: Fraction of the max limit to increase the limit by after each
+    #: successful response.
+    recovery: float
+
+    def __init__(
+        self,
+        limit: float,
+        period: float | timedelta,
+        /,
+        *,
+        buffer: float = 0.0,
+        burst: int = 1,
+        backoff: float = 0.5,
+        recovery: float = 0.01,
+        pushback: Sequence[int] = (429, 503),
+    ) -> None:
+        super().__init__(limit, period, buffer=buffer, burst=burst)
+        self.max_limit = self.limit
+        self.backoff = backoff
+        self.recovery = recovery
+        self.pushback = frozenset(pushback)
+
+    def _get_state(self) -> dict[str, Any]:
+        state = super()._get_state()
+        state["limit"] = self.limit
+        return state
+
+    def _set_state(self, state: dict[str, Any], /) -> None:
+        super()._set_state(state)
+        self.limit = state["limit"]
+        self.interval = self.period / self.limit
+
+    def _update(self, response: requests.Response, /) -> float:
+        with self._lock:
+            wait = super()._update(response)
+            if _from_cache(response):
+                return wait
+
+            if _is_throttled(response, self.pushback):
+                self.limit = max(
+                    self.limit * self.backoff, self.recovery * self.max_limit
+                )
+                retry_after = _parse_retry_after(response)
+                self._tat = max(self._tat, time.perf_counter() + retry_after)
+                wait = max(wait, retry_after)
+            elif response.ok:
+                self.limit = min(
+                    self.limit + self.recovery * self.max_limit, self.max_limit
+                )
+            self.interval = self.period / self.limit
+        return wait
+
+
+class SharedRateLimit(RateLimit):
+    """Share a rate limit's state with all other processes on the same host.
+
+    The state of the wrapped rate limit is stored in a SQLite database file.
+    Each update locks the database file, loads the most recent state, updates
+    the state according to the new response, and then writes the state back
+    to the database file. All processes using a shared rate limit with the
+    same ``name`` and ``path`` cooperatively respect one limit.
+
+    Timestamps are measured with :func:`time.perf_counter`, which is a
+    host-wide monotonic clock on POSIX systems, so states can only be shared
+    between processes on the same host.
+
+    Args:
+        limit: Rate limit whose state is shared.
+        name: Unique name the rate limit's state is stored under.
+        path: Path to the SQLite database file the rate limit's state is
+            stored in. Defaults to :data:`finagg.config.rate_limit_path`.
+
+    """
+
+    #: Rate limit whose state is shared.
+    inner: RateLimit
+
+    #: Unique name the rate limit's state is stored under.
+    name: str
+
+    #: Path to the SQLite database file the rate limit's state is stored in.
+    path: pathlib.Path
+
+    #: Cached connection to the database file.
+    _conn: None | sqlite3.Connection
+
+    #: ID of the process that created the cached connection. Connections
+    #: can't be reused by forked processes.
+    _pid: int
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        name: str,
+        /,
+        *,
+        path: None | str | pathlib.Path = None,
+    ) -> None:
+        super().__init__(limit.limit, limit.period)
+        self.inner = limit
+        self.stats = limit.stats
+        self.name = name
+        self.path = pathlib.Path(path or config.rate_limit_path)
+        self._conn = None
+        self._pid = os.getpid()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["_conn"] = None
+        return state
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Lock the rate limit and its database file and yield a connection
+        to the database file. The locks are released when the context exits.
+
+        """
+        with self._lock:
+            if self._conn is None or self._pid != os.getpid():
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(
+                    self.path,
+                    timeout=60,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+                self._conn.execute("PRAGMA synchronous = OFF")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_limits "
+                    "(name TEXT PRIMARY KEY, state BLOB NOT NULL)"
+                )
+                self._pid = os.getpid()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def _load(self, conn: sqlite3.Connection, /) -> None:
+        """Load the shared state into the wrapped rate limit (if a shared
+        state exists).
+
+        """
+        row = conn.execute(
+            "SELECT state FROM rate_limits WHERE name = ?", (self.name,)
+        ).fetchone()
+        if row is not None:
+            self.inner._set_state(pickle.loads(row[0]))
+
+    def _dump(self, conn: sqlite3.Connection, /) -> None:
+        """Write the wrapped rate limit's state as the shared state."""
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_limits (name, state) VALUES (?, ?)",
+            (self.name, pickle.dumps(self.inner._get_state())),
+        )
+
+    def _reserve(self) -> float:
+        with self._transaction() as conn:
+            self._load(conn)
+            wait = self.inner._reserve()
+            self._dump(conn)
+        return wait
+
+    def _update(self, response: requests.Response, /) -> float:
+        with self._transaction() as conn:
+            self._load(conn)
+            wait = self.inner._update(response)
+            self._dump(conn)
+        return wait
+
+    def eval(self, response: requests.Response, /) -> float | dict[str, float]:
+        return self.inner.eval(response)
+
+
 class RateLimitGuard(Generic[_P]):
     """Wraps requests-like getters to introduce blocking functionality
     when requests are getting close to violating call limits.
 
+    Guards are thread-safe and many threads can safely share the same guard
+    (see :meth:`thread_map`). Reservations are made one thread at a time, and
+    whenever a limit requires throttling, all threads sharing the guard wait
+    before making new requests.
+
     Args:
         f: Requests-style getter that's wrapped and rate-limited.
         limits: Limits to apply to the requests-style getter.
+        retries: Max number of times to retry a request whose response
+            has a status code in :data:`RETRY_STATUS_CODES`. Retries wait
+            according to ``limits`` and exponential backoff with jitter.
         warn: Whether to print a message to stdout whenever client-side
             throttling is occurring to respect ``limits``.
 
@@ -235,26 +673,176 @@ class RateLimitGuard(Generic[_P]):
     #: Limits to apply to requests/responses.
     limits: tuple[RateLimit, ...]
 
+    #: Max number of times to retry a request.
+    retries: int
+
     #: Whether to print a warning when requests are being temporarily blocked
     #: to respect imposed rate limits.
     warn: bool
 
+    #: Telemetry collected by the guard.
+    stats: GuardStats
+
+    #: Monotonic time at which new requests can be made.
+    _resume_ts: float
+
+    #: Lock for making reservations one thread at a time.
+    _lock: threading.Lock
+
+    #: Lock for updating the guard's resume time and telemetry.
+    _state_lock: threading.Lock
+
     def __init__(
         self,
         f: Callable[_P, requests.Response],
         limits: tuple[RateLimit, ...],
         /,
         *,
+        retries: int = 0,
         warn: bool = False,
     ) -> None:
         self.f = f
         self.limits = limits
+        self.retries = retries
         self.warn = warn
+        self.stats = GuardStats(limits=[limit.stats for limit in limits])
+        self._resume_ts = 0.0
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
         update_wrapper(self, f)
+        _guards.add(self)
 
     def __call__(self, *args: _P.args, **kwargs: _P.kwargs) -> requests.Response:
-        """Call the underlying getter and sleep the wait required to
-        satisfy the guard's limits.
+        """Reserve capacity for the request, call the underlying getter,
+        and sleep the wait required to satisfy the guard's limits.
+
+        Args:
+            *args: Args passed to the underlying getter.
+            **kwargs: Kwargs passed to the underlying getter.
+
+        Returns:
+            The received response.
+
+        Raises:
+            `HTTPError`: If the underlying getter raises an HTTP error
+                and the request can't be (or has exhausted) retries.
+
+        """
+        for attempt in range(self.retries + 1):
+            with self._lock:
+                wait = max(self._resume_ts - time.monotonic(), 0.0)
+                for limit in self.limits:
+                    tmp_wait = limit._reserve()
+                    wait = max(wait, tmp_wait)
+                if wait > 0:
+                    if self.warn:
+                        print(f"Throttling requests for {wait:.2f} (s)", flush=True)
+                    time.sleep(wait)
+
+            error = None
+            try:
+                r = self.f(*args, **kwargs)
+            except requests.HTTPError as e:
+                if e.response is None:
+                    raise
+                error, r = e, e.response
+            post_wait = 0.0
+            for limit in self.limits:
+                tmp_wait = limit._update(r)
+                post_wait = max(post_wait, tmp_wait)
+            retry = attempt < self.retries and _is_throttled(r, RETRY_STATUS_CODES)
+            with self._state_lock:
+                if post_wait > 0:
+                    self._resume_ts = max(self._resume_ts, time.monotonic() + post_wait)
+                if retry:
+                    post_wait = max(post_wait, _backoff(attempt))
+                _record(self.stats, r, wait=wait + post_wait, retry=retry)
+            if retry:
+                # Release the response's connection back to the pool.
+                r.close()
+            if post_wait > 0:
+                if self.warn:
+                    print(
+                        f"Throttling requests to {r.url} for {post_wait:.2f} (s)",
+                        flush=True,
+                    )
+                time.sleep(post_wait)
+            if not retry:
+                break
+        if error:
+            raise error
+        return r
+
+
+class AsyncRateLimitGuard(Generic[_P]):
+    """Wraps coroutine requests-like getters to introduce non-blocking
+    waiting when requests are getting close to violating call limits.
+
+    Many tasks can safely share the same guard. Reservations are made one
+    task at a time, and whenever a limit requires throttling, all tasks
+    sharing the guard wait before making new requests.
+
+    Args:
+        f: Coroutine requests-style getter that's wrapped and rate-limited.
+        limits: Limits to apply to the coroutine requests-style getter.
+        retries: Max number of times to retry a request whose response
+            has a status code in :data:`RETRY_STATUS_CODES`. Retries wait
+            according to ``limits`` and exponential backoff with jitter.
+        warn: Whether to print a message to stdout whenever client-side
+            throttling is occurring to respect ``limits``.
+
+    .. seealso::
+        :meth:`async_guard`: For the intended usage of getting an
+            :class:`AsyncRateLimitGuard` instance.
+        :class:`RateLimitGuard`: For the synchronous equivalent.
+
+    """
+
+    #: Coroutine ``requests``-like getter that returns a response.
+    f: Callable[_P, Awaitable[requests.Response]]
+
+    #: Limits to apply to requests/responses.
+    limits: tuple[RateLimit, ...]
+
+    #: Max number of times to retry a request.
+    retries: int
+
+    #: Whether to print a warning when requests are being temporarily blocked
+    #: to respect imposed rate limits.
+    warn: bool
+
+    #: Telemetry collected by the guard.
+    stats: GuardStats
+
+    #: Event loop time at which new requests can be made.
+    _resume_ts: float
+
+    #: Locks for making reservations one task at a time. Locks are bound
+    #: to event loops, so there's one lock per event loop.
+    _locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]
+
+    def __init__(
+        self,
+        f: Callable[_P, Awaitable[requests.Response]],
+        limits: tuple[RateLimit, ...],
+        /,
+        *,
+        retries: int = 0,
+        warn: bool = False,
+    ) -> None:
+        self.f = f
+        self.limits = limits
+        self.retries = retries
+        self.warn = warn
+        self.stats = GuardStats(limits=[limit.stats for limit in limits])
+        self._resume_ts = 0.0
+        self._locks = weakref.WeakKeyDictionary()
+        update_wrapper(self, f)
+        _guards.add(self)
+
+    async def __call__(self, *args: _P.args, **kwargs: _P.kwargs) -> requests.Response:
+        """Reserve capacity for the request, await the underlying getter,
+        and wait as required to satisfy the guard's limits.
 
         Args:
             *args: Args passed to the underlying getter.
@@ -263,26 +851,104 @@ class RateLimitGuard(Generic[_P]):
         Returns:
             The received response.
 
+        Raises:
+            `HTTPError`: If the underlying getter raises an HTTP error
+                and the request can't be (or has exhausted) retries.
+
         """
-        r = self.f(*args, **kwargs)
-        wait = 0.0
-        for limit in self.limits:
-            tmp_wait = limit._update(r)
-            wait = max(wait, tmp_wait)
-        if wait > 0:
-            if self.warn:
-                print(f"Throttling requests to {r.url} for {wait:.2f} (s)", flush=True)
-            time.sleep(wait)
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+
+        for attempt in range(self.retries + 1):
+            async with self._locks[loop]:
+                wait = max(self._resume_ts - loop.time(), 0.0)
+                for limit in self.limits:
+                    tmp_wait = await _call_limit(limit, limit._reserve)
+                    wait = max(wait, tmp_wait)
+                if wait > 0:
+                    if self.warn:
+                        print(f"Throttling requests for {wait:.2f} (s)", flush=True)
+                    await asyncio.sleep(wait)
+
+            error = None
+            try:
+                r = await self.f(*args, **kwargs)
+            except requests.HTTPError as e:
+                if e.response is None:
+                    raise
+                error, r = e, e.response
+            post_wait = 0.0
+            for limit in self.limits:
+                tmp_wait = await _call_limit(limit, limit._update, r)
+                post_wait = max(post_wait, tmp_wait)
+            if post_wait > 0:
+                self._resume_ts = max(self._resume_ts, loop.time() + post_wait)
+            retry = attempt < self.retries and _is_throttled(r, RETRY_STATUS_CODES)
+            if retry:
+                post_wait = max(post_wait, _backoff(attempt))
+            _record(self.stats, r, wait=wait + post_wait, retry=retry)
+            if retry:
+                # Release the response's connection back to the pool.
+                r.close()
+            if post_wait > 0:
+                if self.warn:
+                    print(
+                        f"Throttling requests to {r.url} for {post_wait:.2f} (s)",
+                        flush=True,
+                    )
+                await asyncio.sleep(post_wait)
+            if not retry:
+                break
+        if error:
+            raise error
         return r
 
 
+_guards: weakref.WeakSet[
+    RateLimitGuard[Any] | AsyncRateLimitGuard[Any]
+] = weakref.WeakSet()
+"""All guards that currently exist. Used for collecting telemetry."""
+
+
+def get_stats() -> dict[str, GuardStats]:
+    """Get the telemetry collected by all rate limit guards.
+
+    Useful for determining whether API calls are network bound or
+    spending most of their time waiting to respect rate limits.
+
+    Returns:
+        A mapping of each guarded getter's fully qualified name to the
+        telemetry collected by its guard.
+
+    Examples:
+        >>> stats = finagg.ratelimit.get_stats()
+        >>> stats["finagg.sec.api._get"].requests  # doctest: +SKIP
+        0
+
+    """
+    return {
+        f"{guard.f.__module__}.{guard.f.__qualname__}": guard.stats for guard in _guards
+    }
+
+
 def guard(
-    limits: Sequence[RateLimit], /, *, warn: bool = False
+    limits: Sequence[RateLimit],
+    /,
+    *,
+    retries: int = 0,
+    shared: None | str = None,
+    warn: bool = False,
 ) -> Callable[[Callable[_P, requests.Response],], RateLimitGuard[_P]]:
     """Apply ``limits`` to a requests-style getter.
 
     Args:
         limits: Rate limits to apply to the requests-style getter.
+        retries: Max number of times to retry a request whose response
+            has a status code in :data:`RETRY_STATUS_CODES`.
+        shared: Unique name to share ``limits`` under with all other
+            processes on the same host (see :class:`SharedRateLimit`).
+            Limits are local to the current process if ``None``.
         warn: Whether to print a message when client-side throttling is
             occurring.
 
@@ -300,9 +966,241 @@ def guard(
         ... def get() -> requests.Response:
         ...     return requests.get("https://google.com")
 
+        Space requests to Google evenly so no more than 5 requests are
+        ever sent per second.
+
+        >>> from finagg.ratelimit import GCRARequestLimit
+        >>> @guard([GCRARequestLimit(5, timedelta(seconds=1))])
+        ... def get() -> requests.Response:
+        ...     return requests.get("https://google.com")
+
+        Share the same limit between all processes on the host.
+
+        >>> @guard([RequestLimit(5, timedelta(seconds=1))], shared="google")
+        ... def get() -> requests.Response:
+        ...     return requests.get("https://google.com")
+
     """
 
+    if shared:
+        limits = _share(limits, shared)
+
     def decorator(f: Callable[_P, requests.Response], /) -> RateLimitGuard[_P]:
-        return RateLimitGuard(f, tuple(limits), warn=warn)
+        return RateLimitGuard(f, tuple(limits), retries=retries, warn=warn)
+
+    return decorator
+
+
+def async_guard(
+    limits: Sequence[RateLimit],
+    /,
+    *,
+    retries: int = 0,
+    shared: None | str = None,
+    warn: bool = False,
+) -> Callable[[Callable[_P, Awaitable[requests.Response]],], AsyncRateLimitGuard[_P]]:
+    """Apply ``limits`` to a coroutine requests-style getter.
+
+    This is the :mod:`asyncio` equivalent of :meth:`guard`. The same rate
+    limit instances can be used by both synchronous and asynchronous
+    guards to respect one limit.
+
+    Args:
+        limits: Rate limits to apply to the coroutine requests-style getter.
+        retries: Max number of times to retry a request whose response
+            has a status code in :data:`RETRY_STATUS_CODES`.
+        shared: Unique name to share ``limits`` under with all other
+            processes on the same host (see :class:`SharedRateLimit`).
+            Limits are local to the current process if ``None``.
+        warn: Whether to print a message when client-side throttling is
+            occurring.
+
+    Returns:
+        A decorator that wraps the original coroutine requests-style getter
+        in an :class:`AsyncRateLimitGuard` to avoid exceeding ``limits``.
+
+    Examples:
+        Limit 5 requests to Google per second from any number of tasks.
+
+        >>> import asyncio
+        >>> import requests
+        >>> from datetime import timedelta
+        >>> from finagg.ratelimit import GCRARequestLimit, async_guard
+        >>> @async_guard([GCRARequestLimit(5, timedelta(seconds=1))])
+        ... async def get() -> requests.Response:
+        ...     return await asyncio.to_thread(requests.get, "https://google.com")
+
+    """
+    if shared:
+        limits = _share(limits, shared)
+
+    def decorator(
+        f: Callable[_P, Awaitable[requests.Response]], /
+    ) -> AsyncRateLimitGuard[_P]:
+        return AsyncRateLimitGuard(f, tuple(limits), retries=retries, warn=warn)
 
     return decorator
+
+
+def thread_map(
+    f: Callable[[_T], _R],
+    iterable: Iterable[_T],
+    /,
+    *,
+    max_workers: None | int = None,
+) -> list[_R]:
+    """Call ``f`` on each item in ``iterable`` using a pool of threads.
+
+    This is intended for running many guarded getters (or functions that
+    call guarded getters) concurrently. Guards are thread-safe, so requests
+    made by the threads overlap network latency while still respecting the
+    guards' rate limits.
+
+    Args:
+        f: Function to call on each item (usually a function that calls
+            a guarded getter).
+        iterable: Items to call ``f`` on.
+        max_workers: Max number of threads to use. Defaults to the
+            :class:`concurrent.futures.ThreadPoolExecutor` default.
+
+    Returns:
+        Results of calling ``f`` on each item in the same order as the items
+        in ``iterable``.
+
+    Raises:
+        `Exception`: The first exception raised by ``f`` (if any).
+
+    Examples:
+        Get multiple company concepts concurrently.
+
+        >>> from finagg.ratelimit import thread_map
+        >>> dfs = thread_map(
+        ...     lambda concept: finagg.sec.api.company_concept.get(
+        ...         concept["tag"],
+        ...         ticker="AAPL",
+        ...         taxonomy=concept["taxonomy"],
+        ...         units=concept["units"],
+        ...     ),
+        ...     finagg.sec.api.popular_concepts,
+        ... )  # doctest: +SKIP
+
+    """
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(f, iterable))
+
+
+def _backoff(attempt: int, /, *, base: float = 1.0, cap: float = 60.0) -> float:
+    """Get a random exponential backoff time for a retry attempt (i.e.,
+    exponential backoff with full jitter).
+
+    Args:
+        attempt: Zero-based retry attempt number.
+        base: Backoff time for the first attempt.
+        cap: Max backoff time.
+
+    Returns:
+        Time to wait before retrying (in seconds).
+
+    """
+    return random.uniform(0.0, min(cap, base * 2**attempt))
+
+
+async def _call_limit(
+    limit: RateLimit, f: Callable[..., float], /, *args: Any
+) -> float:
+    """Call a rate limit's method from a coroutine.
+
+    Shared rate limits lock a database file (waiting for other processes
+    to release it), so their methods are run in a separate thread to avoid
+    blocking the event loop.
+
+    Args:
+        limit: Rate limit whose method is called.
+        f: The rate limit's method (e.g., ``limit._reserve``).
+        *args: Args passed to ``f``.
+
+    Returns:
+        The value returned by ``f``.
+
+    """
+    if isinstance(limit, SharedRateLimit):
+        return await asyncio.to_thread(f, *args)
+    return f(*args)
+
+
+def _is_throttled(response: requests.Response, status_codes: frozenset[int], /) -> bool:
+    """Check whether a response indicates the server is throttling requests
+    (or is temporarily unavailable).
+
+    Args:
+        response: Request response.
+        status_codes: Response status codes that indicate throttling.
+
+    Returns:
+        Whether the response's status code is in ``status_codes`` or the
+        response is a ``403`` with a ``Retry-After`` header.
+
+    """
+    if response.status_code in status_codes:
+        return True
+    return response.status_code == 403 and "Retry-After" in response.headers
+
+
+def _parse_retry_after(response: requests.Response, /) -> float:
+    """Parse a response's ``Retry-After`` header into a wait time (in seconds).
+
+    Args:
+        response: Request response.
+
+    Returns:
+        Time to wait according to the header. Zero if the header isn't
+        present or is invalid.
+
+    """
+    value = response.headers.get("Retry-After", None)
+    if not value:
+        return 0.0
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max((dt - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _from_cache(response: requests.Response, /) -> bool:
+    """Whether a response was retrieved from a cache without contacting the
+    server. Cached responses that were revalidated with the server still
+    count as requests.
+
+    """
+    return bool(getattr(response, "from_cache", False)) and not getattr(
+        response, "revalidated", False
+    )
+
+
+def _record(
+    stats: GuardStats, response: requests.Response, /, *, wait: float, retry: bool
+) -> None:
+    """Record a request's response and the wait associated with it in a
+    guard's telemetry.
+
+    """
+    stats.requests += 1
+    stats.cached += _from_cache(response)
+    stats.revalidated += bool(getattr(response, "revalidated", False))
+    stats.retries += retry
+    stats.throttle_time += wait
+
+
+def _share(limits: Sequence[RateLimit], name: str, /) -> list[RateLimit]:
+    """Wrap each limit in ``limits`` so they're shared with all other
+    processes on the same host under a name derived from ``name``.
+
+    """
+    return [SharedRateLimit(limit, f"{name}.{i}") for i, limit in enumerate(limits)]
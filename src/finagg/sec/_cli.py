@@ -10,6 +10,7 @@ import click
 from .. import utils
 from . import api as _api
 from . import feat as _feat
+from . import sql as _sql
 
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO
@@ -96,8 +97,22 @@ def entry_point() -> None:
     default=False,
     help=(
         "Whether to install raw data from bulk data zip files that're compiled by the"
-        " SEC nightly. Installing all SEC data with this option can take upwards of 1.5"
-        " hours to complete."
+        " SEC nightly. Annual and quarterly refined data is computed in the same pass"
+        " over the zip file when installing raw tags data with this option."
+        " Installing all SEC data with this option can take upwards of 1.5 hours to"
+        " complete."
+    ),
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=False,
+    help=(
+        "Whether to only install raw tags data filed after the most recent filing"
+        " date of each tag for each company that's already installed. Annual and"
+        " quarterly refined data is only recomputed for companies with new filings"
+        " when installing raw tags data with this option."
     ),
 )
 @click.option(
@@ -134,6 +149,7 @@ def install(
     ticker: list[str] = [],
     ticker_set: None | Literal["sec"] = None,
     from_zip: bool = False,
+    incremental: bool = False,
     processes: int = mp.cpu_count() - 1,
     recreate_tables: bool = False,
     verbose: bool = False,
@@ -165,6 +181,17 @@ def install(
     elif raw:
         all_raw = set(raw)
 
+    all_refined = set()
+    if all_:
+        all_refined = {
+            "annual",
+            "annual.normalized",
+            "quarterly",
+            "quarterly.normalized",
+        }
+    elif refined:
+        all_refined = set(refined)
+
     all_tickers = utils.expand_csv(ticker)
     if all_raw:
         match ticker_set:
@@ -181,7 +208,7 @@ def install(
         if "submissions" in all_raw:
             if from_zip:
                 total_rows += _feat.submissions.install_from_zip(
-                    all_tickers, recreate_tables=recreate_tables
+                    all_tickers, processes=processes, recreate_tables=recreate_tables
                 )
             else:
                 total_rows += _feat.submissions.install(
@@ -189,25 +216,35 @@ def install(
                 )
 
         if "tags" in all_raw:
+            # Refined features that only depend on tags are computed in the
+            # same pass over the zip file, or only for companies with new
+            # filings when installing incrementally.
+            refined_from_tags: set[Literal["annual", "quarterly"]] = set()
+            if from_zip or incremental:
+                refined_from_tags = {
+                    name for name in ("annual", "quarterly") if name in all_refined
+                }
+                all_refined -= refined_from_tags
             if from_zip:
                 total_rows += _feat.tags.install_from_zip(
-                    all_tickers, processes=processes, recreate_tables=recreate_tables
+                    all_tickers,
+                    processes=processes,
+                    incremental=incremental,
+                    refined=refined_from_tags,
+                    recreate_tables=recreate_tables,
                 )
             else:
                 total_rows += _feat.tags.install(
-                    all_tickers, recreate_tables=recreate_tables
+                    all_tickers,
+                    processes=processes,
+                    incremental=incremental,
+                    refined=refined_from_tags,
+                    recreate_tables=recreate_tables,
                 )
 
-    all_refined = set()
-    if all_:
-        all_refined = {
-            "annual",
-            "annual.normalized",
-            "quarterly",
-            "quarterly.normalized",
-        }
-    elif refined:
-        all_refined = set(refined)
+        # Raw tables are indexed before refined features are installed from
+        # them, even if their indexes are deferred by a bulk install.
+        utils.create_indexes([_sql.submissions, _sql.tags], deferred=True)
 
     if "annual" in all_refined:
         total_rows += _feat.annual.install(
@@ -215,6 +252,7 @@ def install(
         )
 
     if "annual.normalized" in all_refined:
+        utils.create_indexes([_sql.annual], deferred=True)
         total_rows += _feat.annual.normalized.install(
             tickers=all_tickers, processes=processes, recreate_tables=recreate_tables
         )
@@ -225,11 +263,18 @@ def install(
         )
 
     if "quarterly.normalized" in all_refined:
+        utils.create_indexes([_sql.quarterly], deferred=True)
         total_rows += _feat.quarterly.normalized.install(
             tickers=all_tickers, processes=processes, recreate_tables=recreate_tables
         )
 
     if all_ or all_refined or all_raw:
+        # Databases created before indexes were declared are migrated
+        # after installing so indexes are built once. Indexes deferred by a
+        # bulk install are created when the bulk install ends instead.
+        indexes = utils.create_indexes(_sql.metadata.sorted_tables)
+        if indexes:
+            logger.info(f"{indexes} missing indexes created for {__package__}")
         if total_rows:
             logger.info(f"{total_rows} total rows inserted for {__package__}")
         else:
@@ -24,17 +24,22 @@ See the official `SEC EDGAR API docs`_ for more info on the SEC API.
 
 """
 
+import io
+import json
 import logging
 import os
+import pathlib
+import zlib
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
 from functools import cache
-from typing import Any, ClassVar, TypedDict
-from zipfile import ZipFile
+from typing import IO, Any, ClassVar, Iterator, Literal, Sequence, TypedDict, cast
+from zipfile import BadZipFile, ZipFile
 
+import numpy as np
 import pandas as pd
 import requests
-import requests_cache
 from tqdm import tqdm
 
 from .. import config, ratelimit, utils
@@ -44,13 +49,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-if config.disable_http_cache:
-    session = requests.Session()
-else:
-    session = requests_cache.CachedSession(
-        str(config.http_cache_path),
-        expire_after=timedelta(weeks=1),
-    )
+session = utils.make_session(
+    expire_after=timedelta(weeks=1),
+)
+"""Cachable session used for API requests.
+
+:meta hide-value:
+"""
+
+uncached_session = utils.make_session(cache=False)
+"""Uncached session used for API requests that shouldn't be cached. Shares the
+same connection pooling configuration as :data:`session`.
+
+:meta hide-value:
+"""
 
 
 class Concept(TypedDict):
@@ -232,6 +244,10 @@ class CompanyConcept(API):
         Returns:
             Pivoted dataframe with a tag per column.
 
+        Raises:
+            `ValueError`: If both a ``cik`` and ``ticker`` are provided or
+                neither are provided.
+
         Examples:
             >>> finagg.sec.api.company_concept.get_multiple_original(
             ...     finagg.sec.api.popular_concepts,
@@ -245,25 +261,30 @@ class CompanyConcept(API):
             4  2011  Q1  Assets  2010-12-25  8.674200e+10 ...
 
         """
+        if bool(cik) == bool(ticker):
+            raise ValueError("Must provide a `cik` or a `ticker`.")
+
+        if ticker:
+            cik = str(get_cik(ticker, user_agent=user_agent))
+
         start = start or "1776-07-04"
         end = end or utils.today
-        dfs = []
-        for concept in concepts:
-            tag = concept["tag"]
-            taxonomy = concept["taxonomy"]
+
+        def get_original(concept: Concept, /) -> pd.DataFrame:
             units = concept["units"]
             df = cls.get(
-                tag,
+                concept["tag"],
                 cik=cik,
-                ticker=ticker,
-                taxonomy=taxonomy,
+                taxonomy=concept["taxonomy"],
                 units=units,
                 cache=cache,
                 user_agent=user_agent,
             )
             df = filter_original_filings(df, form=form, units=units)
-            df = df[(df["filed"] >= start) & (df["filed"] <= end)]
-            dfs.append(df)
+            return df[(df["filed"] >= start) & (df["filed"] <= end)]
+
+        # Concepts are requested concurrently to overlap network latency.
+        dfs = ratelimit.thread_map(get_original, concepts)
         df = pd.concat(dfs)
         return df
 
@@ -285,6 +306,7 @@ class CompanyFacts(API):
         /,
         *,
         chunk_size: int = 1_000_000,
+        segments: int = 1,
         user_agent: None | str = None,
     ) -> ZipFile:
         """Download all XBRL disclosures for all companies in a zip file.
@@ -292,9 +314,15 @@ class CompanyFacts(API):
         A progress bar displays the download progress as the download could
         take a long time because the zip file is more than 1GB.
         The zip file is updated by the SEC at approximately 3am ET nightly.
+        The download is skipped if the local zip file is already up-to-date,
+        and interrupted downloads are resumed from where they left off.
 
         Args:
             chunk_size: Chunk size to stream and write the zip file with.
+            segments: Number of connections to download the zip file with
+                in parallel. Each connection downloads a separate byte range
+                of the zip file while respecting the SEC API rate limit.
+                Capped at :data:`finagg.config.http_pool_size`.
             user_agent: Self-declared bot header. Defaults to the value
                 found in the ``SEC_API_USER_AGENT`` environment variable.
 
@@ -302,27 +330,13 @@ class CompanyFacts(API):
             A zip file object representing the downloaded zip file.
 
         """
-        response = _get(
+        return _download_zip(
             "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip",
-            cache=False,
-            stream=True,
+            config.root_path / "findata" / "companyfacts.zip",
+            chunk_size=chunk_size,
+            segments=segments,
             user_agent=user_agent,
         )
-        dst = config.root_path / "findata" / "companyfacts.zip"
-        pb = tqdm(
-            total=int(response.headers.get("content-length", 0)),
-            desc=f"Downloading companyfacts.zip to {dst}",
-            position=0,
-            leave=True,
-            unit="iB",
-            unit_scale=True,
-        )
-        with open(dst, "wb") as f:
-            for chunk in response.iter_content(chunk_size):
-                pb.update(len(chunk))
-                f.write(chunk)
-        pb.close()
-        return ZipFile(dst)
 
     @classmethod
     def get(
@@ -534,6 +548,7 @@ class Submissions(API):
         /,
         *,
         chunk_size: int = 1_000_000,
+        segments: int = 1,
         user_agent: None | str = None,
     ) -> ZipFile:
         """Download all SEC filings for all companies in a zip file.
@@ -541,9 +556,15 @@ class Submissions(API):
         A progress bar displays the download progress as the download could
         take a long time because the zip file is more than 1GB.
         The zip file is updated by the SEC at approximately 3am ET nightly.
+        The download is skipped if the local zip file is already up-to-date,
+        and interrupted downloads are resumed from where they left off.
 
         Args:
             chunk_size: Chunk size to stream and write the zip file with.
+            segments: Number of connections to download the zip file with
+                in parallel. Each connection downloads a separate byte range
+                of the zip file while respecting the SEC API rate limit.
+                Capped at :data:`finagg.config.http_pool_size`.
             user_agent: Self-declared bot header. Defaults to the value
                 found in the ``SEC_API_USER_AGENT`` environment variable.
 
@@ -551,27 +572,13 @@ class Submissions(API):
             A zip file object representing the downloaded zip file.
 
         """
-        response = _get(
+        return _download_zip(
             "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip",
-            cache=False,
-            stream=True,
+            config.root_path / "findata" / "submissions.zip",
+            chunk_size=chunk_size,
+            segments=segments,
             user_agent=user_agent,
         )
-        dst = config.root_path / "findata" / "submissions.zip"
-        pb = tqdm(
-            total=int(response.headers.get("content-length", 0)),
-            desc=f"Downloading submissions.zip to {dst}",
-            position=0,
-            leave=True,
-            unit="iB",
-            unit_scale=True,
-        )
-        with open(dst, "wb") as f:
-            for chunk in response.iter_content(chunk_size):
-                pb.update(len(chunk))
-                f.write(chunk)
-        pb.close()
-        return ZipFile(dst)
 
     @classmethod
     def get(
@@ -680,6 +687,14 @@ _cik_to_tickers: dict[str, str] = {}
 # Mapping of (uppercase) tickers to SEC CIK strings.
 _tickers_to_cik: dict[str, str] = {}
 
+tickers_snapshot_path = config.root_path / "findata" / "company_tickers.json"
+"""Path to the most recent snapshot of SEC-registered tickers. The snapshot
+is saved whenever tickers are retrieved from the SEC EDGAR API and is used
+for mapping between SEC CIKs and tickers when the API isn't available.
+
+:meta hide-value:
+"""
+
 company_concept = CompanyConcept()
 """The most popular way for accessing the :class:`CompanyConcept` API
 implementation.
@@ -788,22 +803,32 @@ assets, etc.. Concepts contain all the parameters required for usage with the
 """
 
 
-@ratelimit.guard([ratelimit.RequestLimit(9, timedelta(seconds=1))])
+@ratelimit.guard(
+    [ratelimit.AdaptiveRequestLimit(9, timedelta(seconds=1))],
+    retries=3,
+    shared=__name__ if config.shared_rate_limits else None,
+)
 def _get(
     url: str,
     /,
     *,
+    method: Literal["GET", "HEAD"] = "GET",
     stream: bool = False,
     cache: bool = True,
+    headers: None | dict[str, str] = None,
     user_agent: None | str = None,
 ) -> requests.Response:
     """SEC EDGAR API request helper.
 
     Args:
         url: Complete SEC EDGAR API URL to request from.
+        method: HTTP request method. ``"HEAD"`` is useful for probing
+            file downloads without downloading them.
         stream: Whether to stream the response content (useful for file
             downloads).
         cache: Whether to cache the response from the given URL.
+        headers: Additional request headers (e.g., for conditional or
+            range requests).
         user_agent: Self-declared SEC bot header. Defaults to the value
             found in the ``SEC_API_USER_AGENT`` environment variable.
 
@@ -821,11 +846,11 @@ def _get(
             "Pass your user agent declaration to the API directly, or "
             "set the `SEC_API_USER_AGENT` environment variable."
         )
-    headers = {"User-Agent": user_agent}
+    headers = {**(headers or {}), "User-Agent": user_agent}
     if cache:
-        response = session.get(url, headers=headers, stream=stream)
+        response = session.request(method, url, headers=headers, stream=stream)
     else:
-        response = requests.get(url, headers=headers, stream=stream)
+        response = uncached_session.request(method, url, headers=headers, stream=stream)
     response.raise_for_status()
     return response
 
@@ -926,7 +951,7 @@ def filter_original_filings(
     df = df[mask]
     return (
         df.sort_values(["fy", "fp", "filed"])
-        .groupby(["fy", "fp", "tag"], as_index=False)
+        .groupby(["fy", "fp", "tag"], as_index=False, observed=True)
         .first()
     )
 
@@ -949,13 +974,7 @@ def get_cik(ticker: str, /, *, user_agent: None | str = None) -> str:
         True
 
     """
-    if not _tickers_to_cik:
-        response = _get(Tickers.url, user_agent=user_agent)
-        content: dict[str, dict[str, str]] = response.json()
-        for _, items in content.items():
-            normalized_cik = str(items["cik_str"]).zfill(10)
-            _tickers_to_cik[items["ticker"]] = normalized_cik
-            _cik_to_tickers[normalized_cik] = items["ticker"]
+    _load_tickers(user_agent=user_agent)
     return _tickers_to_cik[ticker.upper()]
 
 
@@ -977,13 +996,7 @@ def get_ticker(cik: str, /, *, user_agent: None | str = None) -> str:
         True
 
     """
-    if not _cik_to_tickers:
-        response = _get(Tickers.url, user_agent=user_agent)
-        content: dict[str, dict[str, str]] = response.json()
-        for _, items in content.items():
-            normalized_cik = str(items["cik_str"]).zfill(10)
-            _cik_to_tickers[normalized_cik] = items["ticker"]
-            _tickers_to_cik[items["ticker"]] = normalized_cik
+    _load_tickers(user_agent=user_agent)
     cik = str(cik).zfill(10)
     return _cik_to_tickers[cik]
 
@@ -1099,40 +1112,595 @@ def group_and_pivot_filings(
                 columns="tag",
                 values="val",
             )
-    df.columns = df.columns.rename(None)
+    df.columns = df.columns.astype(object).rename(None)
     return df
 
 
-def _parse_company_facts(content: dict[str, Any], /) -> pd.DataFrame:
+def _download_zip(
+    url: str,
+    dst: pathlib.Path,
+    /,
+    *,
+    chunk_size: int = 1_000_000,
+    segments: int = 1,
+    user_agent: None | str = None,
+) -> ZipFile:
+    """Download a bulk data zip file, skipping the download if the local zip
+    file is up-to-date and resuming previously interrupted downloads.
+
+    The zip file is streamed to a ``.part`` file next to ``dst`` and only
+    replaces ``dst`` once the download is complete and the zip file's
+    integrity is verified (i.e., its central directory can be read and the
+    CRC of every member matches its data, catching corruption from resumed
+    or segmented downloads). The local zip file's modification time is set
+    to the server's ``Last-Modified`` time so later downloads can be
+    skipped if the server hasn't published a new zip file.
+
+    Args:
+        url: Zip file URL.
+        dst: Local zip file path.
+        chunk_size: Chunk size to stream and write the zip file with.
+        segments: Number of connections to download the zip file with in
+            parallel. Only used for new (not resumed) downloads from servers
+            that support range requests. Capped at
+            :data:`finagg.config.http_pool_size`.
+        user_agent: Self-declared bot header. Defaults to the value
+            found in the ``SEC_API_USER_AGENT`` environment variable.
+
+    Returns:
+        A zip file object representing the downloaded zip file.
+
+    Raises:
+        `BadZipFile`: If the downloaded zip file is incomplete or corrupt.
+        `RuntimeError`: If the zip file changes during a parallel download
+            or a segment's response doesn't match its requested byte range.
+
+    """
+    part = dst.with_name(f"{dst.name}.part")
+    part_info = dst.with_name(f"{dst.name}.part.json")
+    headers = {}
+    offset = 0
+    if part.exists() and part_info.exists():
+        validator = json.loads(part_info.read_text()).get("validator")
+        if validator:
+            offset = part.stat().st_size
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+    elif dst.exists():
+        headers["If-Modified-Since"] = formatdate(dst.stat().st_mtime, usegmt=True)
+
+    # New downloads with multiple segments probe the zip file's size and
+    # range support before deciding how to download it.
+    probe = segments > 1 and not offset
+    try:
+        response = _get(
+            url,
+            method="HEAD" if probe else "GET",
+            cache=False,
+            stream=True,
+            headers=headers,
+            user_agent=user_agent,
+        )
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 416:
+            raise
+        logger.info(f"Restarting download of {dst.name} from the beginning")
+        part.unlink(missing_ok=True)
+        part_info.unlink(missing_ok=True)
+        return _download_zip(
+            url, dst, chunk_size=chunk_size, segments=segments, user_agent=user_agent
+        )
+
+    last_modified = response.headers.get("last-modified", None)
+    content_length = int(response.headers.get("content-length", 0))
+    if dst.exists() and (
+        response.status_code == 304
+        or (
+            response.status_code == 200
+            and last_modified
+            and parsedate_to_datetime(last_modified).timestamp() == dst.stat().st_mtime
+            and content_length == dst.stat().st_size
+        )
+    ):
+        response.close()
+        logger.info(f"{dst} is already up-to-date")
+        return ZipFile(dst)
+
+    if response.status_code == 206:
+        mode = "ab"
+        logger.info(f"Resuming download of {dst.name} from {offset} bytes")
+    else:
+        mode = "wb"
+        offset = 0
+        validator = response.headers.get("etag", None) or last_modified
+        part_info.write_text(
+            json.dumps({"validator": validator, "last_modified": last_modified})
+        )
+    pb = tqdm(
+        total=offset + content_length,
+        initial=offset,
+        desc=f"Downloading {dst.name} to {dst}",
+        position=0,
+        leave=True,
+        unit="iB",
+        unit_scale=True,
+    )
+    if (
+        segments > 1
+        and mode == "wb"
+        and content_length
+        and response.headers.get("accept-ranges", None) == "bytes"
+    ):
+        response.close()
+        try:
+            _download_segments(
+                url,
+                part,
+                content_length,
+                chunk_size=chunk_size,
+                pb=pb,
+                segments=segments,
+                user_agent=user_agent,
+                validator=validator,
+            )
+        except Exception:
+            # Segments are written out of order, so they can't be resumed.
+            part.unlink(missing_ok=True)
+            part_info.unlink(missing_ok=True)
+            raise
+        finally:
+            pb.close()
+    else:
+        if probe:
+            response.close()
+            response = _get(url, cache=False, stream=True, user_agent=user_agent)
+        with open(part, mode) as f:
+            for chunk in response.iter_content(chunk_size):
+                pb.update(len(chunk))
+                f.write(chunk)
+        pb.close()
+
+    if content_length and part.stat().st_size != offset + content_length:
+        raise BadZipFile(
+            f"Downloaded {part.stat().st_size} bytes of {dst.name} "
+            f"but expected {offset + content_length} bytes"
+        )
+    try:
+        with ZipFile(part) as zf:
+            member = zf.testzip()
+        if member is not None:
+            raise BadZipFile(f"{member} within {dst.name} failed its CRC check")
+    except (BadZipFile, EOFError, zlib.error) as e:
+        part.unlink()
+        part_info.unlink(missing_ok=True)
+        if isinstance(e, BadZipFile):
+            raise
+        raise BadZipFile(f"{dst.name} is corrupt") from e
+    last_modified = json.loads(part_info.read_text()).get("last_modified", None)
+    os.replace(part, dst)
+    part_info.unlink()
+    if last_modified:
+        ts = parsedate_to_datetime(last_modified).timestamp()
+        os.utime(dst, (ts, ts))
+    return ZipFile(dst)
+
+
+def _download_segments(
+    url: str,
+    dst: pathlib.Path,
+    size: int,
+    /,
+    *,
+    chunk_size: int,
+    pb: tqdm,
+    segments: int,
+    user_agent: None | str,
+    validator: None | str,
+) -> None:
+    """Download a file with parallel range requests, writing each byte range
+    (segment) into its place within a preallocated file.
+
+    Args:
+        url: File URL.
+        dst: Local file path.
+        size: File size (in bytes).
+        chunk_size: Chunk size to stream and write each segment with.
+        pb: Progress bar to update with the aggregate download progress.
+        segments: Number of segments to download in parallel. Capped at
+            :data:`finagg.config.http_pool_size`.
+        user_agent: Self-declared bot header.
+        validator: ``ETag`` or ``Last-Modified`` value of the file. Used to
+            verify the file doesn't change during the download.
+
+    Raises:
+        `RuntimeError`: If the file changes during the download or a
+            segment's response doesn't match its requested byte range.
+
+    """
+    # Segments beyond the connection pool's size would open connections
+    # that're discarded rather than reused.
+    segments = min(segments, size, config.http_pool_size)
+    with open(dst, "wb") as f:
+        f.truncate(size)
+
+    def download_segment(i: int) -> None:
+        start, end = i * size // segments, (i + 1) * size // segments - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator:
+            headers["If-Range"] = validator
+        response = _get(
+            url, cache=False, stream=True, headers=headers, user_agent=user_agent
+        )
+        if response.status_code != 206:
+            response.close()
+            raise RuntimeError(f"{url} changed while it was being downloaded")
+        content_range = response.headers.get("content-range", "")
+        if content_range != f"bytes {start}-{end}/{size}":
+            response.close()
+            raise RuntimeError(
+                f"Requested bytes {start}-{end}/{size} of {url} but received"
+                f" {content_range!r}"
+            )
+        length = end - start + 1
+        written = 0
+        with open(dst, "r+b") as f:
+            f.seek(start)
+            for chunk in response.iter_content(chunk_size):
+                written += len(chunk)
+                if written > length:
+                    break
+                pb.update(len(chunk))
+                f.write(chunk)
+        response.close()
+        if written != length:
+            raise RuntimeError(
+                f"Downloaded {written} bytes for bytes {start}-{end} of {url} but"
+                f" expected {length} bytes"
+            )
+
+    ratelimit.thread_map(download_segment, range(segments), max_workers=segments)
+
+
+def _load_tickers(*, user_agent: None | str = None) -> None:
+    """Load the mappings between SEC CIKs and tickers if they haven't been
+    loaded already.
+
+    Tickers are retrieved from the SEC EDGAR API, and a snapshot of them is
+    saved to :data:`tickers_snapshot_path` so the mappings can still be
+    loaded when the API isn't available (e.g., when working offline or
+    without a user agent).
+
+    Args:
+        user_agent: Self-declared SEC bot header. Defaults to the value
+            found in the ``SEC_API_USER_AGENT`` environment variable.
+
+    Raises:
+        `RuntimeError`: If tickers can't be retrieved from the API and no
+            snapshot has been saved.
+
+    """
+    if _cik_to_tickers:
+        return
+    content: dict[str, dict[str, str]]
+    try:
+        response = _get(Tickers.url, user_agent=user_agent)
+        content = response.json()
+    except (RuntimeError, requests.RequestException) as e:
+        if not tickers_snapshot_path.exists():
+            raise RuntimeError(
+                "Unable to retrieve tickers from the SEC EDGAR API and no tickers "
+                f"snapshot was found at {tickers_snapshot_path}."
+            ) from e
+        logger.info(f"Using the tickers snapshot at {tickers_snapshot_path}")
+        content = json.loads(tickers_snapshot_path.read_text())
+    else:
+        tickers_snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tickers_snapshot_path.with_name(
+            f"{tickers_snapshot_path.name}.{os.getpid()}"
+        )
+        tmp.write_text(json.dumps(content))
+        os.replace(tmp, tickers_snapshot_path)
+    for _, items in content.items():
+        normalized_cik = str(items["cik_str"]).zfill(10)
+        _cik_to_tickers[normalized_cik] = items["ticker"]
+        _tickers_to_cik[items["ticker"]] = normalized_cik
+
+
+def _add_company_facts_keys(
+    results: pd.DataFrame,
+    keys: list[tuple[str, str, str, str, str]],
+    lengths: list[int],
+    /,
+    *,
+    content: dict[str, Any],
+) -> pd.DataFrame:
+    """Helper for adding the columns that identify each company fact.
+
+    Args:
+        results: Company facts rows, grouped by their keys.
+        keys: Taxonomy, tag, label, description, and units of each group
+            of rows.
+        lengths: Number of rows in each group of rows.
+        content: Company metadata (e.g., the company's CIK) that's added
+            as columns.
+
+    Returns:
+        ``results`` with categorical ``taxonomy``, ``tag``, ``label``,
+        ``description``, and ``units`` columns and company metadata
+        columns.
+
+    """
+    for i, col in enumerate(("taxonomy", "tag", "label", "description", "units")):
+        codes, categories = pd.factorize(
+            np.array([key[i] for key in keys], dtype=object)
+        )
+        # The stubs only accept a sequence of codes, but converting the
+        # codes to a list would box each code as a Python int.
+        results[col] = pd.Categorical.from_codes(
+            cast(Sequence[int], np.repeat(codes, lengths)),
+            categories=pd.Index(categories),
+        )
+    for k, v in content.items():
+        results[k] = v
+    return results
+
+
+def _parse_company_facts(
+    content: dict[str, Any], /, *, concepts: None | Sequence[Concept] = None
+) -> pd.DataFrame:
     """Helper for parsing company facts.
 
     This function is only defined to make parsing company
     facts easier and common between parsing from the REST
     API responses and the bulk zip file.
 
+    Facts are accumulated into one list of values per field and converted
+    into a single dataframe at once. The ``taxonomy``, ``tag``, ``label``,
+    ``description``, and ``units`` columns are categorical to reduce memory
+    usage.
+
     Args:
         content: Company facts JSON data.
+        concepts: Only parse facts for these concepts (taxonomy, tag, and
+            units). This is much faster than parsing all facts and then
+            selecting concepts as only the facts for the given concepts are
+            materialized. Defaults to parsing all facts.
 
     Returns:
         A dataframe equivalent of the company facts data.
 
     """
     facts = content.pop("facts")
-    results_list = []
-    for taxonomy, tag_dict in facts.items():
-        for tag, data in tag_dict.items():
-            for col, rows in data["units"].items():
-                df = pd.DataFrame(rows)
-                df["taxonomy"] = taxonomy
-                df["tag"] = tag
-                df["label"] = data["label"]
-                df["description"] = data["description"]
-                df["units"] = col
-                results_list.append(df)
-    results = pd.concat(results_list)
-    for k, v in content.items():
-        results[k] = v
-    return results
+    columns: dict[str, list[Any]] = {}
+    keys: list[tuple[str, str, str, str, str]] = []
+    lengths: list[int] = []
+    size = 0
+    if concepts is None:
+        for taxonomy, tag_dict in facts.items():
+            for tag, data in tag_dict.items():
+                for units, rows in data["units"].items():
+                    _extend_company_facts_columns(columns, rows, size)
+                    size += len(rows)
+                    keys.append(
+                        (taxonomy, tag, data["label"], data["description"], units)
+                    )
+                    lengths.append(len(rows))
+    else:
+        for concept in concepts:
+            taxonomy, tag, units = concept["taxonomy"], concept["tag"], concept["units"]
+            try:
+                data = facts[taxonomy][tag]
+                rows = data["units"][units]
+            except KeyError:
+                continue
+            _extend_company_facts_columns(columns, rows, size)
+            size += len(rows)
+            keys.append((taxonomy, tag, data["label"], data["description"], units))
+            lengths.append(len(rows))
+    return _add_company_facts_keys(
+        pd.DataFrame(columns), keys, lengths, content=content
+    )
+
+
+def _extend_company_facts_columns(
+    columns: dict[str, list[Any]], rows: list[dict[str, Any]], size: int, /
+) -> None:
+    """Helper for appending a group of company facts to per-field columns.
+
+    Fields that first appear in ``rows`` are backfilled with nulls for the
+    ``size`` facts already in ``columns``, and fields missing from ``rows``
+    are filled with nulls, so all columns stay the same length (the same
+    as building a dataframe from the rows directly).
+
+    Args:
+        columns: Company facts values by field. Updated in-place.
+        rows: Company facts to append.
+        size: Number of facts already in ``columns``.
+
+    """
+    for field in dict.fromkeys(field for row in rows for field in row):
+        if field not in columns:
+            columns[field] = [np.nan] * size
+    for field, values in columns.items():
+        values.extend([row.get(field, np.nan) for row in rows])
+
+
+def _parse_company_facts_stream(
+    fp: IO[bytes],
+    /,
+    *,
+    concepts: None | Sequence[Concept] = None,
+    chunk_size: int = 1_000_000,
+) -> pd.DataFrame:
+    """Helper for parsing company facts from a JSON file object without
+    reading and decoding the entire file at once.
+
+    Facts are decoded one tag at a time. Facts that are kept are converted
+    into columnar dataframes as soon as their tag is decoded, while facts
+    for tags that aren't in ``concepts`` are discarded. Peak memory usage
+    is bounded by the size of the largest decoded tag and the columnar
+    facts that are kept rather than by the size of the file.
+
+    Args:
+        fp: Company facts JSON file object (e.g., a file within the
+            company facts zip file).
+        concepts: Only parse facts for these concepts (taxonomy, tag, and
+            units). Defaults to parsing all facts.
+        chunk_size: Number of characters to read from the file at a time.
+
+    Returns:
+        A dataframe equivalent of the company facts data.
+
+    """
+    wanted: None | dict[tuple[str, str], set[str]] = None
+    if concepts is not None:
+        wanted = {}
+        for concept in concepts:
+            wanted.setdefault((concept["taxonomy"], concept["tag"]), set()).add(
+                concept["units"]
+            )
+    reader = _JSONStream(io.TextIOWrapper(fp, encoding="utf-8"), chunk_size=chunk_size)
+    content: dict[str, Any] = {}
+    facts: dict[tuple[str, str, str], tuple[str, str, pd.DataFrame]] = {}
+    for key in reader.members():
+        if key != "facts":
+            content[key] = reader.value()
+            continue
+        for taxonomy in reader.members():
+            for tag in reader.members():
+                data = reader.value()
+                if wanted is not None and (taxonomy, tag) not in wanted:
+                    continue
+                for units, rows in data["units"].items():
+                    if wanted is not None and units not in wanted[(taxonomy, tag)]:
+                        continue
+                    facts[(taxonomy, tag, units)] = (
+                        data["label"],
+                        data["description"],
+                        pd.DataFrame(rows),
+                    )
+
+    # Facts are ordered the same as they are by `_parse_company_facts`.
+    if concepts is None:
+        order = list(facts)
+    else:
+        order = [
+            (concept["taxonomy"], concept["tag"], concept["units"])
+            for concept in concepts
+            if (concept["taxonomy"], concept["tag"], concept["units"]) in facts
+        ]
+    keys = [(*key[:2], *facts[key][:2], key[2]) for key in order]
+    dfs = [facts[key][2] for key in order]
+    results = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+    lengths = [len(df.index) for df in dfs]
+    return _add_company_facts_keys(results, keys, lengths, content=content)
+
+
+class _JSONStream:
+    """Incrementally decode JSON objects from a text stream one member at a
+    time.
+
+    Args:
+        fp: Text stream to read from.
+        chunk_size: Number of characters to read from the stream at a time.
+
+    """
+
+    #: Text stream being read from.
+    fp: IO[str]
+
+    #: Number of characters to read from the stream at a time.
+    chunk_size: int
+
+    #: Characters read from the stream that haven't been decoded yet
+    #: (starting at ``pos``).
+    buffer: str
+
+    #: Position of the next character to decode within ``buffer``.
+    pos: int
+
+    #: Whether the end of the stream has been reached.
+    eof: bool
+
+    def __init__(self, fp: IO[str], /, *, chunk_size: int = 1_000_000) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int, /) -> bool:
+        """Read at least ``size`` more characters into the buffer, returning
+        whether any characters were read.
+
+        """
+        chunk = self.fp.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char: str, /) -> None:
+        """Consume the next character, making sure it's ``char``."""
+        if self._peek() != char:
+            raise ValueError(
+                f"Expected `{char}` but found `{self.buffer[self.pos]}` in JSON stream"
+            )
+        self.pos += 1
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the next JSON object in the stream.
+
+        Each member's value must be consumed (with :meth:`value` or
+        :meth:`members`) before continuing the iteration.
+
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def value(self) -> Any:
+        """Decode the next JSON value in the stream."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value is incomplete. Read at least as many characters
+                # as are buffered to avoid quadratic decoding time.
+                size = max(self.chunk_size, len(self.buffer) - self.pos)
+                if not self._fill(size):
+                    raise
+                continue
+            # Numbers and literals may be cut off at the end of the buffer.
+            if end == len(self.buffer) and not self.eof:
+                if self._fill(self.chunk_size):
+                    continue
+            self.pos = end
+            return value
 
 
 def _parse_submission_metadata(content: dict[str, Any], /) -> dict[str, Any]:
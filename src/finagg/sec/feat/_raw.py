@@ -2,7 +2,11 @@
 
 import json
 import logging
+import mmap
 import multiprocessing as mp
+from functools import partial
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, TypeVar
 from zipfile import ZipFile
 
 import pandas as pd
@@ -14,11 +18,234 @@ from tqdm import tqdm
 from ... import config, utils
 from .. import api, sql
 
+if TYPE_CHECKING:
+    from ._refined import Annual, Quarterly
+
 logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s", level=logging.INFO
 )
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+def _get_zip_members(
+    zipfile: ZipFile, tickers: set[str], /, *, engine: Engine
+) -> dict[str, str]:
+    """Get the company files within an SEC bulk data zip file that belong to
+    the given tickers.
+
+    Tickers are mapped to SEC CIKs using the raw submissions SQL table
+    (if it exists) and then :func:`finagg.sec.api.get_cik` for any remaining
+    tickers, which falls back to a previously saved tickers snapshot when
+    the SEC EDGAR API isn't available.
+
+    Multiple tickers can belong to the same CIK (e.g., share classes like
+    GOOG and GOOGL). Each file is assigned one ticker deterministically,
+    preferring the ticker in the raw submissions SQL table, then the
+    company's primary ticker according to
+    :func:`finagg.sec.api.get_ticker`, and then the first ticker
+    alphabetically.
+
+    Args:
+        zipfile: SEC bulk data zip file whose files are named by CIK
+            (e.g., ``CIK0000320193.json``).
+        tickers: Set of tickers to get files for.
+        engine: Feature store database engine.
+
+    Returns:
+        A mapping of filenames within the zip file to their tickers.
+
+    """
+    cik_to_ticker = {}
+    if sa.inspect(engine).has_table(sql.submissions.name):
+        with engine.begin() as conn:
+            for cik, ticker in conn.execute(
+                sa.select(sql.submissions.c.cik, sql.submissions.c.ticker)
+            ):
+                if ticker in tickers:
+                    cik_to_ticker[cik] = ticker
+    cik_to_candidates: dict[str, list[str]] = {}
+    for ticker in sorted(tickers - set(cik_to_ticker.values())):
+        try:
+            cik = api.get_cik(ticker)
+        except KeyError:
+            continue
+        if cik not in cik_to_ticker:
+            cik_to_candidates.setdefault(cik, []).append(ticker)
+    for cik, candidates in cik_to_candidates.items():
+        ticker = candidates[0]
+        if len(candidates) > 1 and api.get_ticker(cik) in candidates:
+            ticker = api.get_ticker(cik)
+        cik_to_ticker[cik] = ticker
+    members = {f"CIK{cik}.json": ticker for cik, ticker in cik_to_ticker.items()}
+    return {f: members[f] for f in members.keys() & set(zipfile.namelist())}
+
+
+def _filter_new_filings(
+    df: pd.DataFrame, last_filed: dict[str, str], /
+) -> pd.DataFrame:
+    """Get a company's tag rows that were filed after the most recent
+    filing dates of their tags.
+
+    Args:
+        df: Dataframe of a company's tag rows.
+        last_filed: Mapping of tags to the most recent filing dates of the
+            company's already installed rows (see
+            :meth:`Tags.get_last_filed`).
+
+    Returns:
+        Dataframe with only rows that were filed after their tag's most
+        recent filing date. Rows for tags without a most recent filing
+        date are always kept.
+
+    """
+    if not last_filed:
+        return df
+    last = df["tag"].astype(str).map(last_filed).fillna("")
+    return df[df["filed"].astype(str) > last]
+
+
+def _is_refined_candidate(df: pd.DataFrame, form: str, /) -> bool:
+    """Check whether a company's tags make it a candidate for refined
+    features.
+
+    This uses the same criteria as :meth:`Annual.get_candidate_ticker_set`
+    and :meth:`Quarterly.get_candidate_ticker_set`, but for a dataframe of
+    tags rather than the raw tags SQL table.
+
+    Args:
+        df: Dataframe of a company's tag rows.
+        form: Form type refined features are computed from (``"10-K"`` for
+            annual features or ``"10-Q"`` for quarterly features).
+
+    Returns:
+        Whether the company has at least one filing of type ``form`` for
+        each popular concept.
+
+    """
+    tags = set(df.loc[df["form"] == form, "tag"])
+    return all(concept["tag"] in tags for concept in api.popular_concepts)
+
+
+def _get_refined_features() -> dict[str, type["Annual"] | type["Quarterly"]]:
+    """Get the refined features that're computed directly from raw tags by
+    their names.
+
+    Refined features are imported lazily because they depend on this module.
+
+    """
+    from ._refined import Annual, Quarterly
+
+    return {"annual": Annual, "quarterly": Quarterly}
+
+
+def _has_new_filings(ticker: str, since: str, /) -> bool:
+    """Check whether a company has filed any 10-K or 10-Q forms after
+    ``since`` according to the company's recent SEC filings.
+
+    Recent SEC filings are read from the cached submissions API (e.g., as
+    cached by installing raw submissions beforehand), so checking doesn't
+    require additional requests. Filings made after the cached response
+    are picked up once it expires.
+
+    Args:
+        ticker: Company ticker.
+        since: Filing date (e.g., ``"2023-01-01"``) to compare against.
+
+    Returns:
+        Whether the company has any 10-K or 10-Q filings after ``since``.
+
+    """
+    df = api.submissions.get(ticker=ticker)["filings"]
+    df = df[df["form"].isin(("10-K", "10-Q"))]
+    return bool((df["filingDate"] > since).any())
+
+
+def _get_zip_chunks(
+    zipfile: ZipFile, filenames: Iterable[str], /, *, processes: int
+) -> list[list[str]]:
+    """Group files within a zip file into chunks of work for background
+    processes, from the largest files to the smallest files.
+
+    Chunks are balanced by compressed size rather than by number of files.
+    Large files each get their own chunk so they're spread across processes,
+    while the long tail of small files is grouped into larger chunks (up to
+    32 files) to reduce inter-process communication overhead.
+
+    Args:
+        zipfile: Zip file the files are within.
+        filenames: Files within the zip file to group.
+        processes: Number of background processes the chunks are for.
+
+    Returns:
+        Chunks of filenames, starting with the chunks of the largest files.
+
+    """
+    sizes = {f: zipfile.getinfo(f).compress_size for f in filenames}
+    # Aim for at least 8 chunks per process so processes finish together.
+    target = sum(sizes.values()) / (8 * max(processes, 1))
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    chunk_size = 0
+    for f in sorted(sizes, key=sizes.__getitem__, reverse=True):
+        if chunk and (chunk_size + sizes[f] > target or len(chunk) >= 32):
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+        chunk.append(f)
+        chunk_size += sizes[f]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _map_chunk(f: Callable[[str], _T], chunk: list[str], /) -> list[_T]:
+    """Call ``f`` for each file within a chunk (in a background process)."""
+    return [f(filename) for filename in chunk]
+
+
+class _MMapFile(mmap.mmap):
+    """A memory map that can be read like a regular file by :class:`ZipFile`."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+class _ZipInstallWorker:
+    """Per-process state for installing data from SEC bulk data zip files
+    with multiprocessing.
+
+    :meth:`init` is used as a process pool initializer so each background
+    process opens the zip file once (optionally through a shared read-only
+    memory map when :data:`finagg.config.zip_mmap` is enabled) rather than
+    once per member. When installing incrementally, it also holds the most
+    recent filing dates used to only process new filings.
+
+    """
+
+    #: Zip file opened once per background process.
+    zipfile: None | ZipFile = None
+
+    #: Read-only memory map of the zip file (if :data:`finagg.config.zip_mmap`
+    #: is enabled).
+    buffer: None | _MMapFile = None
+
+    #: Most recent filing dates of each tag for each company (by CIK) used
+    #: for only processing new filings (if installing incrementally).
+    last_filed: None | dict[str, dict[str, str]] = None
+
+    @classmethod
+    def init(
+        cls, zip_filename: str, last_filed: None | dict[str, dict[str, str]] = None
+    ) -> None:
+        cls.last_filed = last_filed
+        if config.zip_mmap:
+            with open(zip_filename, "rb") as f:
+                cls.buffer = _MMapFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+            cls.zipfile = ZipFile(cls.buffer)  # type: ignore[call-overload]
+        else:
+            cls.zipfile = ZipFile(zip_filename)
+
 
 class Submissions:
     """Get a single company's metadata as-is from raw SEC data.
@@ -155,11 +382,41 @@ class Submissions:
                 logger.debug(f"Skipping {ticker}", exc_info=e)
         return total_rows
 
+    @classmethod
+    def _install_from_zip_worker(
+        cls, filename: str, /
+    ) -> tuple[str, None | dict[str, Any]]:
+        """A nasty function to make it easier for processing files within
+        the submissions zip file using multiprocessing.
+
+        The submissions zip file is opened once per worker process by
+        :meth:`_ZipInstallWorker.init`.
+
+        Args:
+            filename: The submissions filename within the zip that's being
+                processed.
+
+        Returns:
+            The company's metadata (``None`` if any error occurs during
+            processing).
+
+        """
+        assert _ZipInstallWorker.zipfile is not None
+        try:
+            content = json.loads(_ZipInstallWorker.zipfile.read(filename))
+            metadata = api._parse_submission_metadata(content)
+        except:
+            return filename, None
+        metadata["cik"] = filename[3:-5]
+        return filename, metadata
+
     @classmethod
     def install_from_zip(
         cls,
         tickers: set[str],
         *,
+        processes: int = mp.cpu_count() - 1,
+        batch_size: int = 1_000,
         engine: None | Engine = None,
         recreate_tables: bool = False,
     ) -> int:
@@ -172,6 +429,9 @@ class Submissions:
 
         Args:
             tickers: Set of tickers to install features for.
+            processes: Number of background processes to use when decoding
+                submissions.
+            batch_size: Number of rows to write to the SQL table at a time.
             engine: Feature store database engine. Defaults to the engine
                 at :data:`finagg.config.engine`.
             recreate_tables: Whether to drop and recreate tables, wiping all
@@ -192,44 +452,71 @@ class Submissions:
         else:
             zipfile = ZipFile(submissions_zipfile_path)
 
-        # Filter by guaranteeing a ticker is actually present in
-        # the set of tickers provided.
-        files = []
-        for f in zipfile.namelist():
-            try:
-                ticker = api.get_ticker(f[3:-5])
-            except KeyError:
-                continue
-            if ticker in tickers:
-                files.append(f)
+        files = _get_zip_members(zipfile, tickers, engine=engine)
+        chunks = _get_zip_chunks(zipfile, files, processes=processes)
 
         total_rows = 0
-        for f in tqdm(
-            files,
-            desc="Installing raw SEC submissions data",
-            position=0,
-            leave=True,
-        ):
+        rows: list[dict[str, Any]] = []
+        with mp.Pool(
+            processes,
+            initializer=_ZipInstallWorker.init,
+            initargs=(zipfile.filename,),
+        ) as pool:
+            for f, metadata in tqdm(
+                chain.from_iterable(
+                    pool.imap_unordered(
+                        partial(_map_chunk, cls._install_from_zip_worker), chunks
+                    )
+                ),
+                total=len(files),
+                desc="Installing raw SEC submissions data",
+                position=0,
+                leave=True,
+            ):
+                if metadata is None:
+                    logger.debug(f"Skipping {f} due to invalid submissions")
+                    continue
+                metadata["ticker"] = files[f]
+                rows.append(metadata)
+                if len(rows) >= batch_size:
+                    total_rows += cls._install_rows(rows, engine=engine)
+                    rows = []
+        total_rows += cls._install_rows(rows, engine=engine)
+        return total_rows
+
+    @classmethod
+    def _install_rows(cls, rows: list[dict[str, Any]], /, *, engine: Engine) -> int:
+        """Write a batch of metadata rows to the raw feature table, falling
+        back to writing rows one at a time if the batch fails so only
+        invalid rows are skipped.
+
+        """
+        if not rows:
+            return 0
+        # Not all companies have the same metadata, so missing metadata is
+        # filled with nulls.
+        keys = set().union(*rows)
+        rows = [{k: row.get(k, None) for k in keys} for row in rows]
+        try:
+            return cls.to_raw(pd.DataFrame(rows), engine=engine)
+        except Exception as e:
+            logger.debug("Retrying batch one row at a time", exc_info=e)
+        total_rows = 0
+        for row in rows:
             try:
-                cik = f[3:-5]
-                ticker = api.get_ticker(cik)
-                data = zipfile.read(f)
-                content = json.loads(data)
-                metadata = api._parse_submission_metadata(content)
-                metadata["cik"] = cik
-                metadata["ticker"] = ticker
-                df = pd.DataFrame(metadata, index=[0])
-                cls.to_raw(df, engine=engine)
-                total_rows += 1
-                logger.debug(f"Inserted row for {f}")
+                total_rows += cls.to_raw(pd.DataFrame(row, index=[0]), engine=engine)
+                logger.debug(f"Inserted row for CIK{row['cik']}")
             except Exception as e:
-                logger.debug(f"Skipping {f}", exc_info=e)
+                logger.debug(f"Skipping CIK{row['cik']}", exc_info=e)
         return total_rows
 
     @classmethod
     def to_raw(cls, df: pd.DataFrame, /, *, engine: None | Engine = None) -> int:
         """Write the given dataframe to the raw feature table.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             df: Dataframe to store as rows in a local SQL table
             engine: Feature store database engine. Defaults to the engine
@@ -242,9 +529,7 @@ class Submissions:
         engine = engine or config.engine
         if not sa.inspect(engine).has_table(sql.submissions.name):
             sql.submissions.create(engine)
-        with engine.begin() as conn:
-            conn.execute(sql.submissions.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df)
+        return utils.bulk_insert(sql.submissions, df, engine=engine, upsert=True)
 
 
 class Tags:
@@ -258,30 +543,52 @@ class Tags:
 
     @classmethod
     def _install_from_zip_worker(
-        cls, args: tuple[str, str]
-    ) -> tuple[str, pd.DataFrame]:
+        cls,
+        filename: str,
+        /,
+        *,
+        refined: frozenset[Literal["annual", "quarterly"]] = frozenset(),
+    ) -> tuple[str, pd.DataFrame, dict[str, pd.DataFrame]]:
         """A nasty function to make it easier for processing files within
         the company facts zip file using multiprocessing.
 
+        The company facts zip file is opened once per worker process by
+        :meth:`_ZipInstallWorker.init`. Each company's facts are decoded at
+        once, or one tag at a time when :data:`finagg.config.zip_stream` is
+        enabled.
+
         Args:
-            args: Tuple of the zip filename and the company facts filename
-                within the zip that's being processed.
+            filename: The company facts filename within the zip that's
+                being processed.
+            refined: Names of refined features to compute from the
+                company's facts.
 
         Returns:
             A dataframe of the company's facts (empty if any error occurs during
-            processing).
+            processing) and a mapping of refined feature names to the
+            company's refined features (features that couldn't be computed
+            are omitted). Only facts filed after the most recent filing dates
+            in :attr:`_ZipInstallWorker.last_filed` are returned when
+            installing incrementally, and refined features are only computed
+            for companies with new facts.
 
         """
-        zip_filename, filename = args
-        zipfile = ZipFile(zip_filename)
+        assert _ZipInstallWorker.zipfile is not None
+        zipfile = _ZipInstallWorker.zipfile
         dfs = []
         cik = filename[3:-5]
-        data = zipfile.read(filename)
-        content = json.loads(data)
         try:
-            df = api._parse_company_facts(content)
+            with zipfile.open(filename) as f:
+                if config.zip_stream:
+                    df = api._parse_company_facts_stream(
+                        f, concepts=api.popular_concepts
+                    )
+                else:
+                    df = api._parse_company_facts(
+                        json.load(f), concepts=api.popular_concepts
+                    )
         except:
-            return filename, pd.DataFrame()
+            return filename, pd.DataFrame(), {}
         df["cik"] = cik
         for concept in api.popular_concepts:
             try:
@@ -297,9 +604,26 @@ class Tags:
                         dfs.append(df_unique)
             except:
                 continue
-        if dfs:
-            return filename, pd.concat(dfs)
-        return filename, pd.DataFrame()
+        if not dfs:
+            return filename, pd.DataFrame(), {}
+        df = pd.concat(dfs)
+        df_new = df
+        if _ZipInstallWorker.last_filed is not None:
+            df_new = _filter_new_filings(df, _ZipInstallWorker.last_filed.get(cik, {}))
+            if not len(df_new.index):
+                return filename, df_new, {}
+
+        features = _get_refined_features()
+        dfs_refined: dict[str, pd.DataFrame] = {}
+        for name in refined:
+            form = "10-K" if name == "annual" else "10-Q"
+            if not _is_refined_candidate(df, form):
+                continue
+            try:
+                dfs_refined[name] = features[name].from_tags(df)
+            except:
+                continue
+        return filename, df_new, dfs_refined
 
     @classmethod
     def from_raw(
@@ -386,6 +710,44 @@ class Tags:
             raise NoResultFound(f"No {tag} rows found for {ticker}.")
         return df.set_index(["fy", "fp", "filed"]).sort_index()
 
+    @classmethod
+    def get_last_filed(
+        cls, *, engine: None | Engine = None
+    ) -> dict[str, dict[str, str]]:
+        """Get the most recent filing date of each tag for each company in
+        the raw SQL table.
+
+        This method is used for incrementally installing tags data, only
+        installing rows that were filed after the rows that're already
+        installed.
+
+        Args:
+            engine: Feature store database engine. Defaults to the engine
+                at :data:`finagg.config.engine`.
+
+        Returns:
+            A mapping of company SEC CIKs to mappings of tags to their most
+            recent filing dates.
+
+        Examples:
+            >>> last_filed = finagg.sec.feat.tags.get_last_filed()  # doctest: +SKIP
+            >>> last_filed["0000320193"]["EarningsPerShareBasic"]  # doctest: +SKIP
+            '2023-08-04'
+
+        """
+        engine = engine or config.engine
+        last_filed: dict[str, dict[str, str]] = {}
+        if not sa.inspect(engine).has_table(sql.tags.name):
+            return last_filed
+        with engine.begin() as conn:
+            for cik, tag, filed in conn.execute(
+                sa.select(
+                    sql.tags.c.cik, sql.tags.c.tag, sa.func.max(sql.tags.c.filed)
+                ).group_by(sql.tags.c.cik, sql.tags.c.tag)
+            ):
+                last_filed.setdefault(cik, {})[tag] = filed
+        return last_filed
+
     @classmethod
     def get_ticker_set(
         cls,
@@ -536,33 +898,57 @@ class Tags:
         cls,
         tickers: None | set[str] = None,
         *,
+        processes: int = mp.cpu_count() - 1,
+        incremental: bool = False,
+        refined: None | set[Literal["annual", "quarterly"]] = None,
         engine: None | Engine = None,
         recreate_tables: bool = False,
     ) -> int:
         """Install data associated with ``tickers`` by pulling data from the
         API, and then writing the data to the raw tags SQL table.
 
+        Refined features can also be recomputed for companies whose raw
+        tags changed (i.e., companies that had rows written) after
+        installing raw tags.
+
         Tables associated with this method are created if they don't already
         exist.
 
         Args:
             tickers: Set of tickers to install features for. Defaults to all
                 the tickers from :meth:`Submissions.get_ticker_set`.
+            processes: Number of background processes to use when
+                recomputing refined features.
+            incremental: Whether to only install rows that were filed after
+                the most recent filing date of each tag for each company
+                (see :meth:`get_last_filed`). Companies without 10-K or 10-Q
+                filings after their most recent filing date (according to
+                their cached recent SEC filings) are skipped entirely.
+            refined: Names of refined features to recompute for companies
+                whose raw tags changed. Options include:
+
+                - "annual" = :class:`finagg.sec.feat.Annual`
+                - "quarterly" = :class:`finagg.sec.feat.Quarterly`
+
             engine: Feature store database engine. Defaults to the engine
                 at :data:`finagg.config.engine`.
             recreate_tables: Whether to drop and recreate tables, wiping all
                 previously installed data.
 
         Returns:
-            Number of rows written to the feature's SQL table.
+            Number of rows written to the raw and refined SQL tables.
 
         """
+        features = _get_refined_features()
+        refined = refined or set()
         tickers = tickers or Submissions.get_ticker_set()
         engine = engine or config.engine
         if recreate_tables or not sa.inspect(engine).has_table(sql.tags.name):
             sql.tags.drop(engine, checkfirst=True)
             sql.tags.create(engine)
 
+        last_filed = cls.get_last_filed(engine=engine) if incremental else {}
+        changed = set()
         total_rows = 0
         for ticker in tqdm(
             tickers,
@@ -570,6 +956,19 @@ class Tags:
             position=0,
             leave=True,
         ):
+            company_last_filed: dict[str, str] = {}
+            if incremental:
+                try:
+                    company_last_filed = last_filed.get(api.get_cik(ticker), {})
+                    if company_last_filed and not _has_new_filings(
+                        ticker, max(company_last_filed.values())
+                    ):
+                        logger.debug(f"Skipping {ticker} due to no new filings")
+                        continue
+                except Exception as e:
+                    logger.debug(f"Skipping {ticker}", exc_info=e)
+                    continue
+
             for concept in api.popular_concepts:
                 tag = concept["tag"]
                 taxonomy = concept["taxonomy"]
@@ -585,9 +984,11 @@ class Tags:
                         df_unique = api.filter_original_filings(
                             df, form=form, units=units
                         )
+                        df_unique = _filter_new_filings(df_unique, company_last_filed)
                         rowcount = len(df_unique.index)
                         if rowcount:
                             cls.to_raw(df_unique, engine=engine)
+                            changed.add(ticker)
                             total_rows += rowcount
                             logger.debug(
                                 f"{rowcount} rows inserted for"
@@ -599,6 +1000,15 @@ class Tags:
                             )
                 except Exception as e:
                     logger.debug(f"Skipping {ticker}", exc_info=e)
+
+        if changed:
+            for name in sorted(refined):
+                total_rows += features[name].install(
+                    changed,
+                    processes=processes,
+                    engine=engine,
+                    recreate_tables=recreate_tables,
+                )
         return total_rows
 
     @classmethod
@@ -607,6 +1017,9 @@ class Tags:
         tickers: None | set[str] = None,
         *,
         processes: int = mp.cpu_count() - 1,
+        incremental: bool = False,
+        raw: bool = True,
+        refined: None | set[Literal["annual", "quarterly"]] = None,
         engine: None | Engine = None,
         recreate_tables: bool = False,
     ) -> int:
@@ -614,6 +1027,21 @@ class Tags:
         facts zip file from the API, and then writing the data to the
         raw tags SQL table.
 
+        Refined features can also be computed directly from each company's
+        facts and written to their refined SQL tables in the same pass,
+        skipping writing and re-reading the raw tags SQL table entirely
+        when ``raw`` is ``False``. Refined features are written using
+        tickers from the raw submissions SQL table, so submissions must be
+        installed beforehand. Refined features are only written for the
+        same candidate companies as :meth:`Annual.install` and
+        :meth:`Quarterly.install` (i.e., companies with raw submissions
+        and at least one 10-K or 10-Q filing for each popular concept).
+
+        When installing incrementally, a fresh company facts zip file is
+        always downloaded, only facts filed after the most recent filing
+        date of each tag for each company are written, and refined features
+        are only recomputed for companies with new facts.
+
         Tables associated with this method are created if they don't already
         exist.
 
@@ -622,63 +1050,125 @@ class Tags:
                 the tickers from :meth:`Submissions.get_ticker_set`.
             processes: Number of background processes to use when installing
                 data.
+            incremental: Whether to only install rows that were filed after
+                the most recent filing date of each tag for each company
+                (see :meth:`get_last_filed`).
+            raw: Whether to write company facts to the raw tags SQL table.
+            refined: Names of refined features to compute from company
+                facts and write to their refined SQL tables. Options
+                include:
+
+                - "annual" = :class:`finagg.sec.feat.Annual`
+                - "quarterly" = :class:`finagg.sec.feat.Quarterly`
+
             engine: Feature store database engine. Defaults to the engine
                 at :data:`finagg.config.engine`.
             recreate_tables: Whether to drop and recreate tables, wiping all
                 previously installed data.
 
         Returns:
-            Number of rows written to the feature's SQL table.
+            Number of rows written to the raw and refined SQL tables.
+
+        Raises:
+            `ValueError`: If installing incrementally without writing to the
+                raw tags SQL table, or if installing refined features without
+                raw submissions.
 
         """
+        if incremental and not raw:
+            raise ValueError(
+                "Installing incrementally requires writing to the raw tags SQL table."
+            )
+
+        features = _get_refined_features()
+        refined = refined or set()
         engine = engine or config.engine
-        if recreate_tables or not sa.inspect(engine).has_table(sql.tags.name):
-            sql.tags.drop(engine, checkfirst=True)
-            sql.tags.create(engine)
+        submitted = Submissions.get_ticker_set(engine=engine)
+        if refined and not submitted:
+            raise ValueError(
+                "Installing refined features requires installing raw submissions"
+                " beforehand (e.g., with finagg.sec.feat.submissions.install)."
+            )
+        tables = [getattr(sql, name) for name in sorted(refined)]
+        if raw:
+            tables.append(sql.tags)
+        for table in tables:
+            if recreate_tables or not sa.inspect(engine).has_table(table.name):
+                table.drop(engine, checkfirst=True)
+                table.create(engine)
 
         company_facts_zipfile_path = config.root_path / "findata" / "companyfacts.zip"
-        if recreate_tables or not company_facts_zipfile_path.exists():
+        if recreate_tables or incremental or not company_facts_zipfile_path.exists():
             zipfile = api.company_facts.download_zip()
         else:
             zipfile = ZipFile(company_facts_zipfile_path)
 
-        # Filter by guaranteeing a ticker is actually present in
-        # the set of tickers provided.
-        tickers = tickers or Submissions.get_ticker_set()
-        args = []
-        for f in zipfile.namelist():
-            try:
-                ticker = api.get_ticker(f[3:-5])
-            except KeyError:
-                continue
-            if ticker in tickers:
-                args.append((zipfile.filename, f))
-
+        tickers = tickers or submitted
+        files = _get_zip_members(zipfile, tickers, engine=engine)
+        if refined and (missing := set(files.values()) - submitted):
+            logger.warning(
+                f"Skipping refined features for {len(missing)} tickers without"
+                " raw submissions"
+            )
+        # Start with the largest files so the long tail of processing
+        # consists of small files that are quick to process.
+        chunks = _get_zip_chunks(zipfile, files, processes=processes)
+        last_filed = cls.get_last_filed(engine=engine) if incremental else None
         total_rows = 0
-        with mp.Pool(processes) as pool:
-            for f, df in tqdm(
-                pool.imap_unordered(cls._install_from_zip_worker, args),  # type: ignore[arg-type]
-                total=len(args),
-                desc="Installing raw SEC tags data",
+        with mp.Pool(
+            processes,
+            initializer=_ZipInstallWorker.init,
+            initargs=(zipfile.filename, last_filed),
+        ) as pool:
+            for f, df, dfs_refined in tqdm(
+                chain.from_iterable(
+                    pool.imap_unordered(
+                        partial(
+                            _map_chunk,
+                            partial(
+                                cls._install_from_zip_worker,
+                                refined=frozenset(refined),
+                            ),
+                        ),
+                        chunks,
+                    )
+                ),
+                total=len(files),
+                desc="Installing SEC tags data",
                 position=0,
                 leave=True,
             ):
-                try:
-                    rowcount = len(df.index)
-                    if rowcount:
+                rowcount = len(df.index)
+                if not rowcount:
+                    logger.debug(f"Skipping {f} due to missing filings")
+                    continue
+                if raw:
+                    try:
                         cls.to_raw(df, engine=engine)
                         total_rows += rowcount
                         logger.debug(f"{rowcount} rows inserted for {f}")
-                    else:
-                        logger.debug(f"Skipping {f} due to missing filings")
-                except Exception as e:
-                    logger.debug(f"Skipping {f}", exc_info=e)
+                    except Exception as e:
+                        logger.debug(f"Skipping {f}", exc_info=e)
+                if files[f] not in submitted:
+                    continue
+                for name in sorted(dfs_refined):
+                    try:
+                        rowcount = features[name].to_refined(
+                            files[f], dfs_refined[name], engine=engine
+                        )
+                        total_rows += rowcount
+                        logger.debug(f"{rowcount} {name} rows inserted for {f}")
+                    except Exception as e:
+                        logger.debug(f"Skipping {name} features for {f}", exc_info=e)
         return total_rows
 
     @classmethod
     def to_raw(cls, df: pd.DataFrame, /, *, engine: None | Engine = None) -> int:
         """Write the given dataframe to the raw feature table.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             df: Dataframe to store as rows in a local SQL table
             engine: Feature store database engine. Defaults to the engine
@@ -691,6 +1181,4 @@ class Tags:
         engine = engine or config.engine
         if not sa.inspect(engine).has_table(sql.tags.name):
             sql.tags.create(engine)
-        with engine.begin() as conn:
-            conn.execute(sql.tags.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df)
+        return utils.bulk_insert(sql.tags, df, engine=engine, upsert=True)
@@ -133,7 +133,7 @@ class IndustryAnnual:
                     .join(
                         sql.submissions,
                         (sql.submissions.c.cik == sql.annual.c.cik)
-                        & (sql.submissions.c.sic.startswith(code)),
+                        & sql._startswith(sql.submissions.c.sic, code),
                     )
                     .where(sql.annual.c.filed >= start, sql.annual.c.filed <= end)
                 )
@@ -552,6 +552,9 @@ class NormalizedAnnual:
     ) -> int:
         """Write the dataframe to the feature store for ``ticker``.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             ticker: Company ticker.
             df: Dataframe to store completely as rows in a local SQL
@@ -568,9 +571,7 @@ class NormalizedAnnual:
             sql.normalized_annual.create(engine)
         df = df.reset_index(["fy", "filed"])
         df["cik"] = sql.get_cik(ticker, engine=engine)
-        with engine.begin() as conn:
-            conn.execute(sql.normalized_annual.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df.index)
+        return utils.bulk_insert(sql.normalized_annual, df, engine=engine, upsert=True)
 
 
 class Annual:
@@ -702,6 +703,36 @@ class Annual:
         )
         return cls._normalize(df)
 
+    @classmethod
+    def from_tags(cls, df: pd.DataFrame, /) -> pd.DataFrame:
+        """Get annual features from a company's raw SEC tags rows.
+
+        This is useful for computing features from tags that haven't been
+        written to the raw SQL table (e.g., facts parsed from the SEC bulk
+        company facts zip file).
+
+        Args:
+            df: Original filings of a single company's popular concepts
+                (i.e., rows of the raw SEC tags SQL table).
+
+        Returns:
+            Annual data dataframe with each tag as a
+            separate column. Sorted by filing date.
+
+        Raises:
+            `NoResultFound`: If there are no 10-K rows for any of the
+                popular concepts.
+
+        """
+        tags = [concept["tag"] for concept in api.popular_concepts]
+        df = df[(df["form"] == "10-K") & df["tag"].isin(tags)]
+        found_tags = set(df["tag"])
+        for tag in tags:
+            if tag not in found_tags:
+                raise NoResultFound(f"No {tag} rows found.")
+        df = api.group_and_pivot_filings(df.astype({"fy": "int64"}), form="10-K")
+        return cls._normalize(df)
+
     @classmethod
     def from_refined(
         cls,
@@ -966,6 +997,9 @@ class Annual:
         """Write the given dataframe to the refined feature table
         while using the ticker ``ticker``.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             ticker: Company ticker.
             df: Dataframe to store as rows in a local SQL table
@@ -981,6 +1015,4 @@ class Annual:
             sql.annual.create(engine)
         df = df.reset_index(["fy", "filed"])
         df["cik"] = sql.get_cik(ticker, engine=engine)
-        with engine.begin() as conn:
-            conn.execute(sql.annual.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df.index)
+        return utils.bulk_insert(sql.annual, df, engine=engine, upsert=True)
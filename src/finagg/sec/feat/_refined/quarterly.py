@@ -133,7 +133,7 @@ class IndustryQuarterly:
                     .join(
                         sql.submissions,
                         (sql.submissions.c.cik == sql.quarterly.c.cik)
-                        & (sql.submissions.c.sic.startswith(code)),
+                        & sql._startswith(sql.submissions.c.sic, code),
                     )
                     .where(sql.quarterly.c.filed >= start, sql.quarterly.c.filed <= end)
                 )
@@ -565,6 +565,9 @@ class NormalizedQuarterly:
     ) -> int:
         """Write the dataframe to the feature store for ``ticker``.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             ticker: Company ticker.
             df: Dataframe to store completely as rows in a local SQL
@@ -581,9 +584,9 @@ class NormalizedQuarterly:
             sql.normalized_quarterly.create(engine)
         df = df.reset_index(["fy", "fp", "filed"])
         df["cik"] = sql.get_cik(ticker, engine=engine)
-        with engine.begin() as conn:
-            conn.execute(sql.normalized_quarterly.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df.index)
+        return utils.bulk_insert(
+            sql.normalized_quarterly, df, engine=engine, upsert=True
+        )
 
 
 class Quarterly:
@@ -719,6 +722,36 @@ class Quarterly:
         )
         return cls._normalize(df)
 
+    @classmethod
+    def from_tags(cls, df: pd.DataFrame, /) -> pd.DataFrame:
+        """Get quarterly features from a company's raw SEC tags rows.
+
+        This is useful for computing features from tags that haven't been
+        written to the raw SQL table (e.g., facts parsed from the SEC bulk
+        company facts zip file).
+
+        Args:
+            df: Original filings of a single company's popular concepts
+                (i.e., rows of the raw SEC tags SQL table).
+
+        Returns:
+            Quarterly data dataframe with each tag as a
+            separate column. Sorted by filing date.
+
+        Raises:
+            `NoResultFound`: If there are no 10-Q rows for any of the
+                popular concepts.
+
+        """
+        tags = [concept["tag"] for concept in api.popular_concepts]
+        df = df[(df["form"] == "10-Q") & df["tag"].isin(tags)]
+        found_tags = set(df["tag"])
+        for tag in tags:
+            if tag not in found_tags:
+                raise NoResultFound(f"No {tag} rows found.")
+        df = api.group_and_pivot_filings(df.astype({"fy": "int64"}), form="10-Q")
+        return cls._normalize(df)
+
     @classmethod
     def from_refined(
         cls,
@@ -983,6 +1016,9 @@ class Quarterly:
         """Write the given dataframe to the refined feature table
         while using the ticker ``ticker``.
 
+        Rows that already exist (i.e., rows with the same primary key) are
+        updated rather than raising an error.
+
         Args:
             ticker: Company ticker.
             df: Dataframe to store as rows in a local SQL table
@@ -998,6 +1034,4 @@ class Quarterly:
             sql.quarterly.create(engine)
         df = df.reset_index(["fy", "fp", "filed"])
         df["cik"] = sql.get_cik(ticker, engine=engine)
-        with engine.begin() as conn:
-            conn.execute(sql.quarterly.insert(), df.to_dict(orient="records"))  # type: ignore[arg-type]
-        return len(df.index)
+        return utils.bulk_insert(sql.quarterly, df, engine=engine, upsert=True)
@@ -37,6 +37,8 @@ submissions = sa.Table(
         sa.String,
         doc="The company's last day of the fiscal year (MMDD).",
     ),
+    sa.Index("ix_sec_raw_submissions_ticker", "ticker"),
+    sa.Index("ix_sec_raw_submissions_sic", "sic"),
 )
 """SQL table for storing raw data as managed by
 :data:`finagg.sec.feat.submissions` (an alias for
@@ -121,6 +123,7 @@ tags = sa.Table(
     ),
     sa.Column("entityName", sa.String, doc="Company name."),
     sa.Column("val", sa.Float, nullable=False, doc="Tag value with units `units`."),
+    sa.Index("ix_sec_raw_tags_form_tag_filed", "form", "tag", "filed"),
 )
 """SQL table for storing raw data as managed by :data:`finagg.sec.feat.tags`
 (an alias for :class:`finagg.sec.feat.Tags`).
@@ -227,6 +230,7 @@ annual = sa.Table(
         nullable=False,
         doc="Current assets over current liabilities.",
     ),
+    sa.Index("ix_sec_refined_annual_fy", "fy"),
 )
 """SQL table for storing refined data as managed by :data:`finagg.sec.feat.annual`
 (an alias for :class:`finagg.sec.feat.Annual`).
@@ -378,6 +382,7 @@ normalized_annual = sa.Table(
             " industry."
         ),
     ),
+    sa.Index("ix_sec_refined_annual_normalized_fy", "fy"),
 )
 """SQL table for storing refined data as managed by
 :attr:`finagg.sec.feat.Annual.normalized` (an alias for
@@ -494,6 +499,7 @@ quarterly = sa.Table(
         nullable=False,
         doc="Current assets over current liabilities.",
     ),
+    sa.Index("ix_sec_refined_quarterly_fy_fp", "fy", "fp"),
 )
 """SQL table for storing refined data as managed by
 :data:`finagg.sec.feat.quarterly` (an alias for
@@ -652,6 +658,7 @@ normalized_quarterly = sa.Table(
             " industry."
         ),
     ),
+    sa.Index("ix_sec_refined_quarterly_normalized_fy_fp", "fy", "fp"),
 )
 """SQL table for storing refined data as managed by
 :attr:`finagg.sec.feat.Quarterly.normalized` (an alias for
@@ -840,10 +847,23 @@ def get_tickers_in_industry(
         tickers = (
             conn.execute(
                 sa.select(submissions.c.ticker).where(
-                    submissions.c.sic.startswith(code)
+                    _startswith(submissions.c.sic, code)
                 )
             )
             .scalars()
             .all()
         )
     return set(tickers)
+
+
+def _startswith(
+    column: sa.ColumnElement[str], prefix: str, /
+) -> sa.ColumnElement[bool]:
+    """Equivalent to ``column.startswith(prefix)``, but as a range comparison
+    so the filter can use an index on ``column`` regardless of dialect.
+
+    """
+    if not prefix:
+        return sa.true()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (column >= prefix) & (column < upper)
@@ -1,20 +1,483 @@
 """Generic utils used by subpackages."""
 
 import csv
+import io
+import itertools
 import logging
 import multiprocessing as mp
 import os
 import pathlib
+import pickle
 import re
-from datetime import datetime
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from functools import cache
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Iterable, Iterator, Mapping, Protocol
 
 import numpy as np
 import pandas as pd
+import requests
+import requests_cache
 import sqlalchemy as sa
 from dotenv import set_key
+from requests.adapters import HTTPAdapter
+from requests_cache.backends import BaseCache, BaseStorage, FileDict, SQLiteDict
+from requests_cache.backends import init_backend as _init_backend
+from sqlalchemy.dialects import mysql, postgresql
 from tqdm import tqdm
+from urllib3.util.retry import Retry
+
+from . import config
+
+#: Number of active :func:`bulk_install` contexts deferring each table's
+#: secondary indexes.
+_deferred_indexes: Counter[sa.Table] = Counter()
+
+#: Number of active :func:`bulk_install` contexts tuning each engine's
+#: connection settings.
+_tuned_engines: Counter[sa.Engine] = Counter()
+
+
+@contextmanager
+def bulk_install(
+    engine: None | sa.Engine = None,
+    /,
+    *,
+    tables: Iterable[sa.Table] = (),
+) -> Iterator[sa.Engine]:
+    """Context manager for a database profile tuned for installing large
+    amounts of data.
+
+    Secondary indexes of ``tables`` are dropped while within the context
+    (including indexes of tables that are recreated within the context) and
+    are created again when exiting the context so they're built once rather
+    than maintained row-by-row. :func:`create_indexes` skips these tables
+    while within the context unless explicitly told to create their indexes
+    early (e.g., to index raw tables before refined features are installed
+    from them). For SQLite databases, write-ahead logging is
+    enabled and the pragmas in :data:`finagg.config.sqlite_bulk_install_pragmas`
+    are set on all new connections while within the context. The previous
+    journal mode and SQLite's default (safe) connection settings are restored
+    when exiting the context.
+
+    Contexts can be nested. Connection settings are only restored, and a
+    table's indexes are only created, when exiting the outermost context
+    that tuned the engine or deferred the table's indexes.
+
+    Args:
+        engine: Feature store database engine. Defaults to the engine
+            at :data:`finagg.config.engine`.
+        tables: Tables whose secondary indexes are rebuilt after installing
+            data.
+
+    Returns:
+        The engine (tuned for installing data while within the context).
+
+    Examples:
+        >>> with finagg.utils.bulk_install(
+        ...     tables=finagg.sec.sql.metadata.sorted_tables
+        ... ) as engine:
+        ...     finagg.sec.feat.tags.install_from_zip(engine=engine)  # doctest: +SKIP
+
+    """
+    engine = engine or config.engine
+    tables = list(dict.fromkeys(tables))
+    inspector = sa.inspect(engine)
+    for table in tables:
+        # Tables (re)created within the context have their indexes dropped
+        # right after they're created.
+        if not _deferred_indexes[table]:
+            sa.event.listen(table, "after_create", _drop_indexes)
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                index.drop(engine)
+
+    # Connection settings can't be changed for in-memory databases
+    # because connections can't be recycled without losing data.
+    tune = (
+        engine.dialect.name == "sqlite"
+        and engine.url.database not in (None, "", ":memory:")
+        and not _tuned_engines[engine]
+    )
+    if tune:
+        pragmas = dict(config.sqlite_bulk_install_pragmas)
+
+        def set_pragmas(dbapi_connection: Any, _: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        with engine.connect() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        engine.dispose()
+        sa.event.listen(engine, "connect", set_pragmas)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    _tuned_engines[engine] += 1
+    _deferred_indexes.update(tables)
+    try:
+        yield engine
+    finally:
+        released = []
+        for table in tables:
+            _deferred_indexes[table] -= 1
+            if not _deferred_indexes[table]:
+                del _deferred_indexes[table]
+                released.append(table)
+        _tuned_engines[engine] -= 1
+        if not _tuned_engines[engine]:
+            del _tuned_engines[engine]
+        if tune:
+            sa.event.remove(engine, "connect", set_pragmas)
+            engine.dispose()
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+        for table in released:
+            sa.event.remove(table, "after_create", _drop_indexes)
+        create_indexes(released, engine=engine)
+
+
+def _drop_indexes(table: sa.Table, conn: sa.Connection, /, **_: Any) -> None:
+    """Drop a table's secondary indexes right after the table is created."""
+    for index in table.indexes:
+        index.drop(conn)
+
+
+def bulk_insert(
+    table: sa.Table,
+    df: pd.DataFrame,
+    /,
+    *,
+    engine: sa.Engine,
+    batch_size: None | int = None,
+    upsert: bool = False,
+) -> int:
+    """Write a dataframe's rows to a SQL table using the fastest write
+    method available for the database's dialect.
+
+    Rows are built directly from the dataframe's column arrays (rather than
+    from per-row records) and are written with:
+
+        1. Multi-row ``INSERT ... VALUES`` statements for SQLite
+        2. ``COPY ... FROM STDIN`` for PostgreSQL (with the psycopg2 driver)
+        3. A single ``executemany`` insert for all other dialects
+
+    Args:
+        table: SQL table to write rows to. Dataframe columns that aren't
+            in the table are ignored.
+        df: Dataframe to write as rows. Null values are written as SQL
+            nulls.
+        engine: Feature store database engine.
+        batch_size: Maximum number of rows to write per transaction.
+            Defaults to :data:`finagg.config.bulk_insert_batch_size`.
+        upsert: Whether to update rows that already exist (according to
+            the table's primary key) rather than raising an error
+            (``INSERT ... ON CONFLICT DO UPDATE`` for SQLite and
+            PostgreSQL, ``INSERT ... ON DUPLICATE KEY UPDATE`` for MySQL,
+            and deleting conflicting rows before inserting them for all
+            other dialects).
+
+    Returns:
+        Number of rows written to the SQL table.
+
+    Examples:
+        >>> import sqlalchemy as sa
+        >>> engine = sa.create_engine("sqlite://")
+        >>> table = sa.Table(
+        ...     "example",
+        ...     sa.MetaData(),
+        ...     sa.Column("a", sa.Integer),
+        ...     sa.Column("b", sa.Float),
+        ... )
+        >>> table.create(engine)
+        >>> df = pd.DataFrame({"a": [1, 2], "b": [0.5, None], "c": ["x", "y"]})
+        >>> finagg.utils.bulk_insert(table, df, engine=engine)
+        2
+
+    """
+    batch_size = batch_size or config.bulk_insert_batch_size
+    columns = [c.name for c in table.columns if c.name in df.columns]
+    arrays = []
+    for column in columns:
+        series = df[column]
+        if series.hasnans:
+            values = series.to_numpy(dtype=object)
+            values[series.isna().to_numpy()] = None
+            arrays.append(values.tolist())
+        else:
+            arrays.append(series.tolist())
+    rows = list(zip(*arrays))
+    match engine.dialect.name, engine.dialect.driver:
+        case "sqlite", _:
+            write_fn = _insert_values
+        case "postgresql", "psycopg2":
+            write_fn = _copy_from
+        case _:
+            write_fn = _insert_many
+    for i in range(0, len(rows), batch_size):
+        with engine.begin() as conn:
+            write_fn(conn, table, columns, rows[i : i + batch_size], upsert=upsert)
+    return len(rows)
+
+
+_COPY_NULL = "\\N"
+"""Marker for SQL nulls in CSV data written with ``COPY ... FROM STDIN``."""
+
+
+def _to_copy_csv(
+    rows: Iterable[tuple[Any, ...]],
+    /,
+    *,
+    types: None | Iterable[sa.types.TypeEngine[Any]] = None,
+) -> io.StringIO:
+    """Encode rows as CSV data for PostgreSQL's ``COPY ... FROM STDIN``.
+
+    Nulls are written as the unquoted :data:`_COPY_NULL` marker, numbers
+    are written unquoted, and all other values are quoted so empty strings
+    (and strings that look like the null marker) aren't read as nulls.
+    Whole floats in integer columns (e.g., integers held in a float column
+    because of nulls) are written as integers because ``COPY`` rejects
+    values like ``2020.0`` for integer columns.
+
+    Args:
+        rows: Rows of values to encode.
+        types: SQL types of each row's values. Defaults to encoding values
+            by their Python types alone.
+
+    """
+
+    def encode(value: Any) -> str:
+        if value is None:
+            return _COPY_NULL
+        if isinstance(value, (int, float)):
+            return str(value)
+        return '"' + str(value).replace('"', '""') + '"'
+
+    def encode_int(value: Any) -> str:
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return encode(value)
+
+    encoders = [
+        encode_int if isinstance(type_, sa.Integer) else encode
+        for type_ in (types or ())
+    ]
+    buffer = io.StringIO()
+    for row in rows:
+        if encoders:
+            buffer.write(",".join(f(v) for f, v in zip(encoders, row)))
+        else:
+            buffer.write(",".join(map(encode, row)))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_from(
+    conn: sa.Connection,
+    table: sa.Table,
+    columns: list[str],
+    rows: list[tuple[Any, ...]],
+    /,
+    *,
+    upsert: bool = False,
+) -> None:
+    """Write rows to a PostgreSQL table with ``COPY ... FROM STDIN``.
+
+    Rows are copied into a temporary staging table and then upserted from
+    the staging table if ``upsert`` is ``True``.
+
+    """
+    preparer = conn.dialect.identifier_preparer
+    target = preparer.format_table(table)
+    column_list = ", ".join(preparer.quote(c) for c in columns)
+    if upsert:
+        staging = preparer.quote(f"staging.{table.name}")
+        conn.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE {staging} (LIKE {target} INCLUDING DEFAULTS)"
+            " ON COMMIT DROP"
+        )
+    buffer = _to_copy_csv(rows, types=[table.c[c].type for c in columns])
+    statement = (
+        f"COPY {staging if upsert else target} ({column_list})"
+        f" FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+    )
+    dbapi = conn.dialect.loaded_dbapi
+    cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(statement, buffer)
+    except dbapi.Error as e:
+        # Raise the same exceptions as statements executed by SQLAlchemy.
+        raise sa.exc.DBAPIError.instance(statement, None, e, dbapi.Error) from e
+    finally:
+        cursor.close()
+    if upsert:
+        conn.exec_driver_sql(
+            f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM"
+            f" {staging}{_on_conflict(conn, table, columns)}"
+        )
+
+
+def _insert_many(
+    conn: sa.Connection,
+    table: sa.Table,
+    columns: list[str],
+    rows: list[tuple[Any, ...]],
+    /,
+    *,
+    upsert: bool = False,
+) -> None:
+    """Write rows to a table with a single ``executemany`` insert.
+
+    Upserts use the dialect's upsert statement for PostgreSQL and MySQL.
+    Rows with conflicting primary keys are deleted before rows are inserted
+    (within the same transaction) for all other dialects.
+
+    """
+    keys = [c.name for c in table.primary_key.columns]
+    statement: sa.Insert = table.insert()
+    if upsert and keys and set(keys) <= set(columns):
+        updates = [c for c in columns if c not in keys]
+        match conn.dialect.name:
+            case "postgresql":
+                pg_statement = postgresql.insert(table)
+                if updates:
+                    statement = pg_statement.on_conflict_do_update(
+                        index_elements=keys,
+                        set_={c: pg_statement.excluded[c] for c in updates},
+                    )
+                else:
+                    statement = pg_statement.on_conflict_do_nothing(index_elements=keys)
+            case "mysql" | "mariadb":
+                mysql_statement = mysql.insert(table)
+                # At least one column must be updated, so rows that only
+                # consist of their primary key update their key to itself.
+                statement = mysql_statement.on_duplicate_key_update(
+                    {c: mysql_statement.inserted[c] for c in updates or keys[:1]}
+                )
+            case _:
+                conn.execute(
+                    table.delete().where(
+                        *(table.c[k] == sa.bindparam(f"pk_{k}") for k in keys)
+                    ),
+                    [{f"pk_{k}": row[columns.index(k)] for k in keys} for row in rows],
+                )
+    conn.execute(statement, [dict(zip(columns, row)) for row in rows])
+
+
+def _insert_values(
+    conn: sa.Connection,
+    table: sa.Table,
+    columns: list[str],
+    rows: list[tuple[Any, ...]],
+    /,
+    *,
+    upsert: bool = False,
+) -> None:
+    """Write rows to a SQLite table with multi-row ``INSERT ... VALUES``
+    statements, binding as many rows per statement as SQLite allows.
+
+    """
+    if not rows:
+        return
+    preparer = conn.dialect.identifier_preparer
+    prefix = (
+        f"INSERT INTO {preparer.format_table(table)}"
+        f" ({', '.join(preparer.quote(c) for c in columns)}) VALUES "
+    )
+    suffix = _on_conflict(conn, table, columns) if upsert else ""
+    placeholders = f"({', '.join('?' * len(columns))})"
+    max_variables = 32766 if sqlite3.sqlite_version_info >= (3, 32) else 999
+    n = max(1, max_variables // max(len(columns), 1))
+    full = len(rows) - len(rows) % n
+    if full:
+        conn.exec_driver_sql(
+            prefix + ", ".join([placeholders] * n) + suffix,
+            [
+                tuple(itertools.chain.from_iterable(rows[i : i + n]))
+                for i in range(0, full, n)
+            ],
+        )
+    if full < len(rows):
+        conn.exec_driver_sql(
+            prefix + ", ".join([placeholders] * (len(rows) - full)) + suffix,
+            tuple(itertools.chain.from_iterable(rows[full:])),
+        )
+
+
+def _on_conflict(conn: sa.Connection, table: sa.Table, columns: list[str], /) -> str:
+    """Get the ``ON CONFLICT`` clause for upserting rows into a table by its
+    primary key (supported by both SQLite and PostgreSQL).
+
+    """
+    keys = [c.name for c in table.primary_key.columns]
+    if not keys:
+        return ""
+    preparer = conn.dialect.identifier_preparer
+    target = ", ".join(preparer.quote(c) for c in keys)
+    updates = [preparer.quote(c) for c in columns if c not in keys]
+    if not updates:
+        return f" ON CONFLICT ({target}) DO NOTHING"
+    return f" ON CONFLICT ({target}) DO UPDATE SET " + ", ".join(
+        f"{c} = excluded.{c}" for c in updates
+    )
+
+
+def create_indexes(
+    tables: Iterable[sa.Table],
+    /,
+    *,
+    deferred: bool = False,
+    engine: None | sa.Engine = None,
+) -> int:
+    """Create the secondary indexes declared for tables that already exist
+    in the database but are missing those indexes.
+
+    Tables are only created with their indexes when they don't already
+    exist, so this is the migration path for adding indexes to databases
+    that were created before the indexes were declared.
+
+    Args:
+        tables: Tables whose missing indexes are created. Tables that don't
+            exist in the database are skipped.
+        deferred: Whether to also create indexes for tables whose indexes
+            are deferred by an active :func:`bulk_install` context. Those
+            tables are skipped otherwise (their indexes are created when
+            the context exits).
+        engine: Feature store database engine. Defaults to the engine
+            at :data:`finagg.config.engine`.
+
+    Returns:
+        Number of indexes created.
+
+    Examples:
+        >>> finagg.utils.create_indexes(finagg.sec.sql.metadata.sorted_tables)  # doctest: +SKIP
+        0
+
+    """
+    engine = engine or config.engine
+    inspector = sa.inspect(engine)
+    created = 0
+    for table in tables:
+        if table in _deferred_indexes and not deferred:
+            continue
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                created += 1
+    return created
 
 
 def expand_csv(values: str | list[str], /) -> set[str]:
@@ -82,6 +545,320 @@ def get_func_cols(table: sa.Table | pd.DataFrame, /) -> list[str]:
     return [col for col in cols if parse_func_call(col)]
 
 
+class LRUStorage(BaseStorage):
+    """HTTP cache storage that evicts the least recently used responses once
+    the total size of all cached responses exceeds a maximum size.
+
+    Wraps the response storage of any :mod:`requests_cache` backend. The
+    recency of responses is tracked in-process; responses already in a
+    persistent cache are assumed to be used in the order they were written.
+    All responses are measured by their serialized size.
+
+    Args:
+        storage: Response storage to wrap.
+        max_size: Maximum total size of all cached responses (in bytes).
+
+    """
+
+    #: Wrapped response storage.
+    storage: BaseStorage
+
+    #: Maximum total size of all cached responses (in bytes).
+    max_size: int
+
+    #: Current total size of all cached responses (in bytes).
+    size: int
+
+    #: Cached response keys and sizes ordered from least to most recently used.
+    _index: OrderedDict[str, int]
+
+    #: Lock for updating the index and total size.
+    _index_lock: threading.Lock
+
+    def __init__(self, storage: BaseStorage, /, *, max_size: int) -> None:
+        self.storage = storage
+        self.max_size = max_size
+        self._serializer = storage.serializer
+        self._index = OrderedDict(_iter_sizes(storage))
+        self._index_lock = threading.Lock()
+        self.size = sum(self._index.values())
+        self._evict()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.storage, name)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.storage[key]
+        with self._index_lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.storage[key] = value
+        with self._index_lock:
+            self.size -= self._index.pop(key, 0)
+            self._index[key] = _sizeof(value, serializer=self.storage.serializer)
+            self.size += self._index[key]
+        self._evict()
+
+    def __delitem__(self, key: str) -> None:
+        del self.storage[key]
+        with self._index_lock:
+            self.size -= self._index.pop(key, 0)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.storage)
+
+    def __len__(self) -> int:
+        return len(self.storage)
+
+    def _evict(self) -> None:
+        """Evict least recently used responses until the total size of all
+        cached responses is within the maximum size. The most recently used
+        response is never evicted.
+
+        """
+        evicted = []
+        with self._index_lock:
+            while self.size > self.max_size and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self.size -= size
+                evicted.append(key)
+        if evicted:
+            self.storage.bulk_delete(evicted)
+
+    def bulk_delete(self, keys: None | Iterable[str] = None, **kwargs: Any) -> None:
+        """Delete multiple responses without raising errors for missing keys."""
+        keys = list(keys or [])
+        self.storage.bulk_delete(keys=keys, **kwargs)
+        with self._index_lock:
+            for key in keys:
+                self.size -= self._index.pop(key, 0)
+
+    def clear(self) -> None:
+        """Delete all responses."""
+        self.storage.clear()
+        with self._index_lock:
+            self._index.clear()
+            self.size = 0
+
+
+class ExpirationRules(Mapping[str, timedelta | datetime]):
+    """HTTP cache expiration rules that resolve times of day to the next
+    occurrence of that time of day whenever a rule is accessed.
+
+    Used as the ``urls_expire_after`` setting of cachable sessions so
+    responses from APIs that refresh their data at specific times of day
+    expire right when new data becomes available.
+
+    Args:
+        rules: Mapping of URL glob patterns to either an expiration
+            duration or a timezone-aware time of day at which responses
+            expire. Defaults to :data:`finagg.config.http_cache_expire_after`.
+            The mapping isn't copied so changes to it are reflected in the
+            rules.
+
+    Examples:
+        >>> from datetime import time, timezone
+        >>> rules = finagg.utils.ExpirationRules({"example.com": time(3, tzinfo=timezone.utc)})
+        >>> rules["example.com"] > datetime.now(timezone.utc)
+        True
+
+    """
+
+    #: Mapping of URL glob patterns to expiration durations or times of day.
+    rules: dict[str, timedelta | time]
+
+    def __init__(self, rules: None | dict[str, timedelta | time] = None, /) -> None:
+        self.rules = config.http_cache_expire_after if rules is None else rules
+
+    def __getitem__(self, pattern: str) -> timedelta | datetime:
+        expire_after = self.rules[pattern]
+        if isinstance(expire_after, time):
+            now = datetime.now(expire_after.tzinfo)
+            expires = datetime.combine(now.date(), expire_after)
+            if expires <= now:
+                expires += timedelta(days=1)
+            return expires
+        return expire_after
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def make_cache(
+    backend: None | str = None, /, *, max_size: None | int = None
+) -> BaseCache:
+    """Make an HTTP cache backend according to the :mod:`finagg.config`.
+
+    Caches made with the same backend and maximum size share the same
+    response storage so the maximum size applies to all APIs combined
+    rather than to each API individually.
+
+    Args:
+        backend: Cache backend name. One of ``"sqlite"``, ``"filesystem"``,
+            or ``"memory"``. Defaults to :data:`finagg.config.http_cache_backend`.
+        max_size: Maximum total size of all cached responses (in megabytes).
+            Least recently used responses are evicted once this size is
+            exceeded. ``0`` means unbounded. Defaults to
+            :data:`finagg.config.http_cache_max_size`.
+
+    Returns:
+        A new HTTP cache backend.
+
+    Raises:
+        `ValueError`: If the backend name isn't valid.
+
+    Examples:
+        >>> cache = finagg.utils.make_cache("memory", max_size=1)
+        >>> cache.responses.max_size
+        1000000
+
+    """
+    backend = backend or config.http_cache_backend
+    if backend not in ("sqlite", "filesystem", "memory"):
+        raise ValueError(
+            f"Invalid HTTP cache backend `{backend}`. "
+            "Choose from `sqlite`, `filesystem`, or `memory`."
+        )
+    max_size = config.http_cache_max_size if max_size is None else max_size
+    http_cache = _init_backend(str(config.http_cache_path), backend)
+    if max_size:
+        http_cache.responses = _get_lru_storage(backend, max_size)
+    return http_cache
+
+
+def make_session(
+    *,
+    cache: bool = True,
+    pool_size: None | int = None,
+    max_retries: int = 3,
+    **kwargs: Any,
+) -> requests.Session:
+    """Make an HTTP session that reuses keep-alive connections to each host.
+
+    All API implementations use sessions made by this function for both
+    cached and uncached requests so TCP/TLS connections are reused across
+    requests rather than opened anew for each request. Cachable sessions
+    revalidate expired responses with conditional requests and reuse
+    cached responses that haven't been modified.
+
+    Args:
+        cache: Whether to make a cachable session. An uncached session is
+            made regardless of this value if :data:`finagg.config.disable_http_cache`
+            is set.
+        pool_size: Maximum number of connections to reuse per host. Defaults
+            to :data:`finagg.config.http_pool_size`.
+        max_retries: Number of times to retry failed connections and reads.
+            Retrying on response status codes is left to rate limit guards
+            (see :func:`finagg.ratelimit.guard`).
+        **kwargs: Keyword arguments passed to the cachable session's
+            constructor (e.g., ``expire_after``). URL-specific expiration
+            rules default to :class:`ExpirationRules`.
+
+    Returns:
+        A new HTTP session.
+
+    Examples:
+        >>> session = finagg.utils.make_session(cache=False)
+        >>> session.headers["Connection"]
+        'keep-alive'
+
+    """
+    pool_size = pool_size or config.http_pool_size
+    session: requests.Session
+    if cache and not config.disable_http_cache:
+        kwargs.setdefault("urls_expire_after", ExpirationRules())
+        session = _RevalidatingSession(backend=make_cache(), **kwargs)
+    else:
+        session = requests.Session()
+    retry = Retry(
+        total=max_retries,
+        status=0,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=0.5,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    )
+    return session
+
+
+class _RevalidatingSession(requests_cache.CachedSession):
+    """Cachable session that marks cached responses that were revalidated.
+
+    Expired responses are revalidated with conditional requests (i.e., with
+    ``If-None-Match`` and ``If-Modified-Since`` headers), and the cached
+    response is reused if the server responds with "304 Not Modified".
+    Revalidated responses have a ``revalidated`` attribute so rate limits
+    can still count them as requests (see :mod:`finagg.ratelimit`).
+
+    """
+
+    def _update_revalidated_response(
+        self, actions: Any, response: requests.Response, cached_response: Any
+    ) -> Any:
+        cached_response = super()._update_revalidated_response(
+            actions, response, cached_response
+        )
+        revalidated_response = requests_cache.CachedResponse.from_response(
+            cached_response, expires=cached_response.expires
+        )
+        revalidated_response.cache_key = cached_response.cache_key
+        revalidated_response.revalidated = True
+        return revalidated_response
+
+
+@cache
+def _get_lru_storage(backend: str, max_size: int, /) -> LRUStorage:
+    """Get the response storage shared by all HTTP caches of the same backend
+    and maximum size (in megabytes).
+
+    """
+    storage = _init_backend(str(config.http_cache_path), backend).responses
+    return LRUStorage(storage, max_size=max_size * 1_000_000)
+
+
+def _iter_sizes(storage: BaseStorage, /) -> Iterator[tuple[str, int]]:
+    """Iterate over the keys and sizes (in bytes) of responses in a storage
+    from least to most recently written.
+
+    """
+    if isinstance(storage, SQLiteDict):
+        with storage.connection() as con:
+            yield from con.execute(
+                f"SELECT key, length(value) FROM {storage.table_name} ORDER BY rowid"
+            ).fetchall()
+    elif isinstance(storage, FileDict):
+        stats = [(path.stem, path.stat()) for path in storage.paths()]
+        for key, stat in sorted(stats, key=lambda x: x[1].st_mtime):
+            yield key, stat.st_size
+    else:
+        for key in list(storage):
+            yield key, _sizeof(storage[key], serializer=storage.serializer)
+
+
+def _sizeof(response: Any, /, *, serializer: Any = None) -> int:
+    """Size of a cached response (in bytes) as serialized by its storage's
+    serializer (or :mod:`pickle` for storages that don't serialize
+    responses), the same as the size of responses already in persistent
+    storages.
+
+    """
+    data = pickle.dumps(response) if serializer is None else serializer.dumps(response)
+    return len(data.encode() if isinstance(data, str) else data)
+
+
 def parse_func_call(s: str, /) -> None | tuple[str, list[str]]:
     """Parse a function's name and its arguments' names from a string of format
     ``FUNC(arg0, arg1, ...)``.
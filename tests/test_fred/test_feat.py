@@ -3,7 +3,6 @@ from typing import Generator
 import pandas as pd
 import pytest
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import IntegrityError
 
 import finagg
 
@@ -31,11 +30,10 @@ def test_economic_to_from_refined(engine: Engine) -> None:
         df1,
         engine=engine,
     )
-    with pytest.raises(IntegrityError):
-        finagg.fred.feat.economic.to_refined(
-            df1,
-            engine=engine,
-        )
+    assert finagg.fred.feat.economic.to_refined(
+        df1,
+        engine=engine,
+    ) == len(df1.index)
 
     df2 = finagg.fred.feat.economic.from_refined(
         engine=engine,
@@ -1,3 +1,7 @@
+import asyncio
+import pathlib
+import threading
+import time
 from typing import Generator
 from unittest.mock import patch
 
@@ -75,3 +79,213 @@ def test_size_limit_update(expected_wait: list[int]) -> None:
     response._content = b"0"
     for wait in expected_wait:
         assert limit._update(response) == wait
+
+
+def test_shared_rate_limit_update(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "rate_limits.sqlite"
+    limit1 = finagg.ratelimit.SharedRateLimit(
+        finagg.ratelimit.RequestLimit(LIMIT, PERIOD), "test", path=path
+    )
+    limit2 = finagg.ratelimit.SharedRateLimit(
+        finagg.ratelimit.RequestLimit(LIMIT, PERIOD), "test", path=path
+    )
+    response = requests.Response()
+    assert limit1._update(response) == 0.0
+    assert limit2._update(response) == 0.0
+    assert limit1._update(response) > 0.0
+    assert len(limit2.inner._rate_limit_datas) == 2
+    assert limit2._update(response) > 0.0
+    assert len(limit2.inner._rate_limit_datas) == 4
+
+
+@patch("time.perf_counter", side_effect=[0, 0, 0, 0, 0.5, 10])
+def test_gcra_request_limit_reserve(_) -> None:
+    limit = finagg.ratelimit.GCRARequestLimit(LIMIT, PERIOD, burst=2)
+    interval = PERIOD / LIMIT
+    assert limit._reserve() == 0.0
+    assert limit._reserve() == 0.0
+    assert limit._reserve() == pytest.approx(interval)
+    assert limit._reserve() == pytest.approx(2 * interval)
+    response = requests.Response()
+    response.from_cache = True  # type: ignore[attr-defined]
+    assert limit._update(response) == 0.0
+    assert limit._reserve() == pytest.approx(2 * interval - 0.5)
+    assert limit._reserve() == 0.0
+
+
+def test_async_guard() -> None:
+    limit = finagg.ratelimit.GCRARequestLimit(LIMIT, 0.3)
+    response = requests.Response()
+
+    @finagg.ratelimit.async_guard([limit])
+    async def get() -> requests.Response:
+        return response
+
+    async def main() -> list[requests.Response]:
+        return await asyncio.gather(*(get() for _ in range(2 * LIMIT)))
+
+    start = time.perf_counter()
+    assert all(r is response for r in asyncio.run(main()))
+    assert time.perf_counter() - start >= (2 * LIMIT - 1) * limit.interval * 0.9
+
+
+def test_async_guard_shared(tmp_path: pathlib.Path) -> None:
+    inner = finagg.ratelimit.GCRARequestLimit(1000, PERIOD)
+    limit = finagg.ratelimit.SharedRateLimit(
+        inner, "test", path=tmp_path / "ratelimits.sqlite"
+    )
+    response = requests.Response()
+    threads = set()
+    reserve, update = inner._reserve, inner._update
+
+    def spy_reserve() -> float:
+        threads.add(threading.get_ident())
+        return reserve()
+
+    def spy_update(response: requests.Response, /) -> float:
+        threads.add(threading.get_ident())
+        return update(response)
+
+    @finagg.ratelimit.async_guard([limit])
+    async def get() -> requests.Response:
+        return response
+
+    async def main() -> tuple[int, requests.Response]:
+        return threading.get_ident(), await get()
+
+    with patch.object(inner, "_reserve", spy_reserve), patch.object(
+        inner, "_update", spy_update
+    ):
+        loop_thread, r = asyncio.run(main())
+    assert r is response
+    # Shared rate limits lock their database file outside the event loop.
+    assert threads and loop_thread not in threads
+
+
+def test_adaptive_request_limit_update() -> None:
+    limit = finagg.ratelimit.AdaptiveRequestLimit(LIMIT, PERIOD, recovery=0.1)
+    throttled_response = requests.Response()
+    throttled_response.status_code = 429
+    throttled_response.headers["Retry-After"] = "5"
+    ok_response = requests.Response()
+    ok_response.status_code = 200
+    assert limit._update(throttled_response) == 5.0
+    assert limit.limit == LIMIT / 2
+    assert limit._update(ok_response) == 0.0
+    assert limit.limit == pytest.approx(LIMIT / 2 + 0.1 * LIMIT)
+    assert limit.interval == pytest.approx(PERIOD / limit.limit)
+
+
+def test_limits_count_revalidated_responses() -> None:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"abc"
+    response.from_cache = True  # type: ignore[attr-defined]
+    limits: list[finagg.ratelimit.RateLimit] = [
+        finagg.ratelimit.RequestLimit(LIMIT, PERIOD),
+        finagg.ratelimit.ErrorLimit(LIMIT, PERIOD),
+        finagg.ratelimit.SizeLimit(LIMIT, PERIOD),
+    ]
+    assert [limit.eval(response) for limit in limits] == [0.0, 0.0, 0.0]
+    response.revalidated = True  # type: ignore[attr-defined]
+    assert [limit.eval(response) for limit in limits] == [1.0, 0.0, 0.0]
+    response.from_cache = False  # type: ignore[attr-defined]
+    response.revalidated = False  # type: ignore[attr-defined]
+    assert [limit.eval(response) for limit in limits] == [1.0, 0.0, 3.0]
+
+
+@patch("time.sleep")
+def test_guard_retries(sleep) -> None:
+    throttled_response = requests.Response()
+    throttled_response.status_code = 429
+    ok_response = requests.Response()
+    ok_response.status_code = 200
+    responses = [throttled_response, throttled_response, ok_response]
+
+    @finagg.ratelimit.guard([finagg.ratelimit.ErrorLimit(LIMIT, PERIOD)], retries=2)
+    def get() -> requests.Response:
+        r = responses.pop(0)
+        r.raise_for_status()
+        return r
+
+    with patch.object(throttled_response, "close") as close:
+        assert get() is ok_response
+        assert sleep.call_count >= 2
+        assert close.call_count == 2
+
+        responses = [throttled_response, throttled_response]
+        get.retries = 1
+        with pytest.raises(requests.HTTPError):
+            get()
+        assert not responses
+        assert close.call_count == 3
+
+
+@patch("time.sleep")
+def test_guard_retries_forbidden(sleep) -> None:
+    forbidden_response = requests.Response()
+    forbidden_response.status_code = 403
+    calls = 0
+
+    @finagg.ratelimit.guard([finagg.ratelimit.ErrorLimit(LIMIT, PERIOD)], retries=2)
+    def get() -> requests.Response:
+        nonlocal calls
+        calls += 1
+        forbidden_response.raise_for_status()
+        return forbidden_response
+
+    with patch.object(forbidden_response, "close"):
+        with pytest.raises(requests.HTTPError):
+            get()
+        assert calls == 1
+
+        forbidden_response.headers["Retry-After"] = "1"
+        with pytest.raises(requests.HTTPError):
+            get()
+        assert calls == 4
+
+
+def test_adaptive_request_limit_forbidden() -> None:
+    limit = finagg.ratelimit.AdaptiveRequestLimit(10, PERIOD)
+    response = requests.Response()
+    response.status_code = 403
+    limit._update(response)
+    assert limit.limit == limit.max_limit
+    response.headers["Retry-After"] = "0"
+    limit._update(response)
+    assert limit.limit == limit.max_limit * limit.backoff
+
+
+def test_guard_stats() -> None:
+    limit = finagg.ratelimit.RequestLimit(1000, PERIOD)
+    response = requests.Response()
+    response.status_code = 200
+
+    @finagg.ratelimit.guard([limit])
+    def get() -> requests.Response:
+        return response
+
+    for _ in range(3):
+        get()
+    stats = finagg.ratelimit.get_stats()[f"{__name__}.{get.__qualname__}"]
+    assert stats.requests == 3
+    assert stats.cached == 0
+    assert stats.retries == 0
+    assert stats.limits == [limit.stats]
+    assert limit.stats.total == 3
+    assert limit.stats.peak_utilization == 3 / 1000
+
+
+def test_thread_map() -> None:
+    limit = finagg.ratelimit.RequestLimit(1000, PERIOD)
+    response = requests.Response()
+
+    @finagg.ratelimit.guard([limit])
+    def get(_: int) -> requests.Response:
+        return response
+
+    n = 200
+    results = finagg.ratelimit.thread_map(get, range(n), max_workers=16)
+    assert all(r is response for r in results)
+    assert len(limit._rate_limit_datas) == n
+    assert limit._running_totals.quantity == n
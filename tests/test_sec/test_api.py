@@ -1,3 +1,14 @@
+import io
+import json
+import pathlib
+import zipfile
+from typing import Any
+
+import pandas as pd
+import pytest
+import requests
+import sqlalchemy as sa
+
 import finagg
 
 
@@ -15,3 +26,231 @@ def test_submissions_get() -> None:
 
 def test_tickers_get() -> None:
     finagg.sec.api.tickers.get()
+
+
+def test_download_zip(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("CIK0000320193.json", "{}")
+    content = buffer.getvalue()
+    last_modified = "Wed, 01 Mar 2023 08:00:00 GMT"
+    calls = []
+    methods = []
+    # Byte offset to misrange or truncate parallel segment responses at.
+    misrange = truncate = None
+
+    def _get(
+        _: str,
+        /,
+        *,
+        method: str = "GET",
+        headers: None | dict[str, str] = None,
+        **__: object,
+    ) -> requests.Response:
+        headers = headers or {}
+        calls.append(headers)
+        methods.append(method)
+        response = requests.Response()
+        response.headers["Last-Modified"] = last_modified
+        if "If-Modified-Since" in headers:
+            response.status_code = 304
+            response.raw = io.BytesIO()
+        elif "Range" in headers:
+            start, end = headers["Range"][len("bytes=") :].split("-")
+            start, end = int(start), int(end or len(content) - 1)
+            if start == misrange:
+                start += 1
+            segment = content[start : end + 1]
+            if start == truncate:
+                segment = segment[:-1]
+            response.status_code = 206
+            response.headers["Content-Length"] = str(len(segment))
+            response.headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            response.raw = io.BytesIO(segment)
+        else:
+            response.status_code = 200
+            response.headers["Accept-Ranges"] = "bytes"
+            response.headers["Content-Length"] = str(len(content))
+            response.raw = io.BytesIO(b"" if method == "HEAD" else content)
+        return response
+
+    monkeypatch.setattr(finagg.sec.api, "_get", _get)
+    dst = tmp_path / "companyfacts.zip"
+    url = "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip"
+    finagg.sec.api._download_zip(url, dst).close()
+    assert dst.read_bytes() == content
+    assert not calls[0]
+
+    finagg.sec.api._download_zip(url, dst).close()
+    assert "If-Modified-Since" in calls[1]
+
+    dst.unlink()
+    (tmp_path / "companyfacts.zip.part").write_bytes(content[:10])
+    (tmp_path / "companyfacts.zip.part.json").write_text(
+        json.dumps({"validator": last_modified, "last_modified": last_modified})
+    )
+    with finagg.sec.api._download_zip(url, dst) as zf:
+        assert zf.namelist() == ["CIK0000320193.json"]
+    assert calls[2]["Range"] == "bytes=10-"
+    assert not (tmp_path / "companyfacts.zip.part").exists()
+
+    # Resumed downloads with corrupt member data are discarded.
+    dst.unlink()
+    offset = content.index(b"{}")
+    (tmp_path / "companyfacts.zip.part").write_bytes(content[:offset] + b"[]")
+    (tmp_path / "companyfacts.zip.part.json").write_text(
+        json.dumps({"validator": last_modified, "last_modified": last_modified})
+    )
+    with pytest.raises(zipfile.BadZipFile, match="failed its CRC check"):
+        finagg.sec.api._download_zip(url, dst)
+    assert not dst.exists()
+    assert not (tmp_path / "companyfacts.zip.part").exists()
+    assert not (tmp_path / "companyfacts.zip.part.json").exists()
+
+    calls.clear()
+    methods.clear()
+    finagg.sec.api._download_zip(url, dst, segments=3).close()
+    assert dst.read_bytes() == content
+    assert len(calls) == 4
+    assert methods == ["HEAD", "GET", "GET", "GET"]
+
+    dst.unlink()
+    for misrange, truncate in ((0, None), (None, 0)):
+        with pytest.raises(RuntimeError):
+            finagg.sec.api._download_zip(url, dst, segments=3)
+        assert not dst.exists()
+        assert not (tmp_path / "companyfacts.zip.part").exists()
+
+    # Segments are capped at the connection pool size.
+    misrange = truncate = None
+    monkeypatch.setattr(finagg.config, "http_pool_size", 2)
+    calls.clear()
+    finagg.sec.api._download_zip(url, dst, segments=3).close()
+    assert dst.read_bytes() == content
+    assert len(calls) == 3
+
+
+def test_load_tickers_snapshot(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    content = {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}}
+    snapshot = tmp_path / "company_tickers.json"
+    monkeypatch.setattr(finagg.sec.api, "tickers_snapshot_path", snapshot)
+    monkeypatch.setattr(finagg.sec.api, "_cik_to_tickers", {})
+    monkeypatch.setattr(finagg.sec.api, "_tickers_to_cik", {})
+
+    def _get(*args: Any, **kwargs: Any) -> requests.Response:
+        raise requests.ConnectionError
+
+    monkeypatch.setattr(finagg.sec.api, "_get", _get)
+    with pytest.raises(RuntimeError):
+        finagg.sec.api.get_cik("AAPL")
+
+    snapshot.write_text(json.dumps(content))
+    assert finagg.sec.api.get_cik("AAPL") == "0000320193"
+    assert finagg.sec.api.get_ticker("320193") == "AAPL"
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("CIK0000320193.json", "{}")
+        zf.writestr("CIK0000789019.json", "{}")
+    engine = sa.create_engine("sqlite://")
+    with zipfile.ZipFile(buffer) as zf:
+        assert finagg.sec.feat._raw._get_zip_members(
+            zf, {"AAPL", "MSFT"}, engine=engine
+        ) == {"CIK0000320193.json": "AAPL"}
+
+
+def test_parse_company_facts_concepts() -> None:
+    def content() -> dict[str, Any]:
+        return {
+            "cik": 320193,
+            "entityName": "Apple Inc.",
+            "facts": {
+                "dei": {
+                    "EntityCommonStockSharesOutstanding": {
+                        "label": "Shares Outstanding",
+                        "description": "Shares outstanding.",
+                        "units": {"shares": [{"end": "2009-06-27", "val": 1}]},
+                    }
+                },
+                "us-gaap": {
+                    "Assets": {
+                        "label": "Assets",
+                        "description": "Total assets.",
+                        "units": {
+                            "USD": [
+                                {"end": "2009-06-27", "val": 2},
+                                {"end": "2009-09-26", "val": 3},
+                            ]
+                        },
+                    }
+                },
+            },
+        }
+
+    concepts: list[finagg.sec.api.Concept] = [
+        {"tag": "Assets", "taxonomy": "us-gaap", "units": "USD"},
+        {"tag": "Liabilities", "taxonomy": "us-gaap", "units": "USD"},
+    ]
+    df = finagg.sec.api._parse_company_facts(content(), concepts=concepts)
+    expected = finagg.sec.api._parse_company_facts(content())
+    expected = expected[expected["tag"] == "Assets"].reset_index(drop=True)
+    assert isinstance(df["tag"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(df.astype(str), expected.astype(str))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1_000_000])
+def test_parse_company_facts_stream(chunk_size: int) -> None:
+    content = {
+        "cik": 320193,
+        "entityName": "Apple Inc.",
+        "facts": {
+            "dei": {},
+            "us-gaap": {
+                "Assets": {
+                    "label": "Assets",
+                    "description": None,
+                    "units": {
+                        "USD": [
+                            {"end": "2009-06-27", "val": 2.5, "fy": 2009},
+                            {"end": "2009-09-26", "val": -3, "fy": None},
+                        ]
+                    },
+                },
+                "Liabilities": {
+                    "label": "Liabilities",
+                    "description": "Total liabilities.",
+                    "units": {
+                        "USD": [{"end": "2009-06-27", "val": 1e10}],
+                        "EUR": [{"end": "2009-06-27", "val": 9e9, "frame": "CY"}],
+                    },
+                },
+            },
+        },
+    }
+    data = json.dumps(content, indent=1).encode()
+    for concepts in (
+        None,
+        [
+            {"tag": "Liabilities", "taxonomy": "us-gaap", "units": "USD"},
+            {"tag": "Assets", "taxonomy": "us-gaap", "units": "USD"},
+            {"tag": "Assets", "taxonomy": "dei", "units": "USD"},
+        ],
+    ):
+        df = finagg.sec.api._parse_company_facts_stream(
+            io.BytesIO(data), concepts=concepts, chunk_size=chunk_size
+        )
+        expected = finagg.sec.api._parse_company_facts(
+            json.loads(data), concepts=concepts
+        )
+        pd.testing.assert_frame_equal(df, expected)
+
+    content["facts"] = {}
+    data = json.dumps(content).encode()
+    df = finagg.sec.api._parse_company_facts_stream(
+        io.BytesIO(data), chunk_size=chunk_size
+    )
+    pd.testing.assert_frame_equal(
+        df, finagg.sec.api._parse_company_facts(json.loads(data))
+    )
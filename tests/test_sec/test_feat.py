@@ -1,9 +1,13 @@
-from typing import Generator
+import json
+import logging
+import pathlib
+import zipfile
+from typing import Any, Callable, Generator, Iterable, Literal
 
 import pandas as pd
 import pytest
+import sqlalchemy as sa
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import IntegrityError
 
 import finagg
 
@@ -15,6 +19,45 @@ def engine() -> Generator[Engine, None, None]:
     )
 
 
+def make_facts(fys: Iterable[int], /, *, scale: int = 1) -> list[dict[str, Any]]:
+    """Make a concept's company facts rows with original 10-Q filings for the
+    first three quarters and an original 10-K filing for each fiscal year.
+
+    """
+    rows = []
+    for fy in fys:
+        for i, fp in enumerate(["Q1", "Q2", "Q3", "FY"]):
+            rows.append(
+                {
+                    "accn": f"{fy}{fp}",
+                    "end": f"{fy}-{3 * i + 1:02d}-28",
+                    "filed": f"{fy}-{3 * i + 2:02d}-15",
+                    "form": "10-K" if fp == "FY" else "10-Q",
+                    "fp": fp,
+                    "fy": fy,
+                    "val": scale * (fy - 2000 + i),
+                }
+            )
+    return rows
+
+
+def make_company_facts(
+    cik: str, concepts: list[finagg.sec.api.Concept], fys: Iterable[int], /
+) -> str:
+    """Make a company's company facts zip file contents with facts from
+    :func:`make_facts` for each concept.
+
+    """
+    facts: dict[str, dict[str, Any]] = {}
+    for j, concept in enumerate(concepts):
+        facts.setdefault(concept["taxonomy"], {})[concept["tag"]] = {
+            "label": concept["tag"],
+            "description": concept["tag"],
+            "units": {concept["units"]: make_facts(fys, scale=(j + 1) * int(cik))},
+        }
+    return json.dumps({"cik": int(cik), "entityName": cik, "facts": facts})
+
+
 def test_annual_all_equal(engine: Engine) -> None:
     finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
     finagg.sec.feat.tags.install({"AAPL"}, engine=engine)
@@ -26,6 +69,16 @@ def test_annual_all_equal(engine: Engine) -> None:
     pd.testing.assert_frame_equal(df1, df3, rtol=1e-4)
 
 
+def test_annual_from_tags(engine: Engine) -> None:
+    finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
+    finagg.sec.feat.tags.install({"AAPL"}, engine=engine)
+    with engine.begin() as conn:
+        df = pd.DataFrame(conn.execute(finagg.sec.sql.tags.select()))
+    df1 = finagg.sec.feat.annual.from_raw("AAPL", engine=engine)
+    df2 = finagg.sec.feat.annual.from_tags(df)
+    pd.testing.assert_frame_equal(df1, df2, rtol=1e-4)
+
+
 def test_annual_get_candidate_ticker_set(engine: Engine) -> None:
     finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
     finagg.sec.feat.tags.install({"AAPL"}, engine=engine)
@@ -53,8 +106,9 @@ def test_annual_to_from_refined(engine: Engine) -> None:
     finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
     df1 = finagg.sec.feat.annual.from_api("AAPL")
     finagg.sec.feat.annual.to_refined("AAPL", df1, engine=engine)
-    with pytest.raises(IntegrityError):
-        finagg.sec.feat.annual.to_refined("AAPL", df1, engine=engine)
+    assert finagg.sec.feat.annual.to_refined("AAPL", df1, engine=engine) == len(
+        df1.index
+    )
 
     df2 = finagg.sec.feat.annual.from_refined("AAPL", engine=engine)
     pd.testing.assert_frame_equal(df1, df2, rtol=1e-4)
@@ -71,6 +125,16 @@ def test_quarterly_all_equal(engine: Engine) -> None:
     pd.testing.assert_frame_equal(df1, df3, rtol=1e-4)
 
 
+def test_quarterly_from_tags(engine: Engine) -> None:
+    finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
+    finagg.sec.feat.tags.install({"AAPL"}, engine=engine)
+    with engine.begin() as conn:
+        df = pd.DataFrame(conn.execute(finagg.sec.sql.tags.select()))
+    df1 = finagg.sec.feat.quarterly.from_raw("AAPL", engine=engine)
+    df2 = finagg.sec.feat.quarterly.from_tags(df)
+    pd.testing.assert_frame_equal(df1, df2, rtol=1e-4)
+
+
 def test_quarterly_get_candidate_ticker_set(engine: Engine) -> None:
     finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
     finagg.sec.feat.tags.install({"AAPL"}, engine=engine)
@@ -98,8 +162,363 @@ def test_quarterly_to_from_refined(engine: Engine) -> None:
     finagg.sec.feat.submissions.install({"AAPL"}, engine=engine)
     df1 = finagg.sec.feat.quarterly.from_api("AAPL")
     finagg.sec.feat.quarterly.to_refined("AAPL", df1, engine=engine)
-    with pytest.raises(IntegrityError):
-        finagg.sec.feat.quarterly.to_refined("AAPL", df1, engine=engine)
+    assert finagg.sec.feat.quarterly.to_refined("AAPL", df1, engine=engine) == len(
+        df1.index
+    )
 
     df2 = finagg.sec.feat.quarterly.from_refined("AAPL", engine=engine)
     pd.testing.assert_frame_equal(df1, df2, rtol=1e-4)
+
+
+def test_submissions_install_from_zip(
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+    engine: Engine,
+) -> None:
+    ciks = {f"T{i}": f"{i:010d}" for i in range(1, 7)}
+    (tmp_path / "findata").mkdir()
+    with zipfile.ZipFile(tmp_path / "findata" / "submissions.zip", "w") as zf:
+        for ticker, cik in ciks.items():
+            content = {"cik": cik, "name": ticker, "sic": "1000"}
+            match ticker:
+                case "T3":
+                    # Missing a required column, failing the whole batch.
+                    del content["sic"]
+                case "T5":
+                    zf.writestr(f"CIK{cik}.json", "{malformed")
+                    continue
+            zf.writestr(f"CIK{cik}.json", json.dumps(content))
+    monkeypatch.setattr(finagg.config, "root_path", tmp_path)
+    monkeypatch.setattr(finagg.sec.api, "get_cik", ciks.__getitem__)
+    with caplog.at_level(logging.DEBUG, logger=finagg.sec.feat._raw.__name__):
+        total_rows = finagg.sec.feat.submissions.install_from_zip(
+            set(ciks), processes=2, batch_size=2, engine=engine
+        )
+    assert total_rows == 4
+    assert "Retrying batch one row at a time" in caplog.messages
+    assert "Skipping CIK0000000003" in caplog.messages
+    assert "Skipping CIK0000000005.json due to invalid submissions" in caplog.messages
+    with engine.begin() as conn:
+        rows = conn.execute(
+            sa.select(
+                finagg.sec.sql.submissions.c.ticker, finagg.sec.sql.submissions.c.cik
+            )
+        ).all()
+    assert dict(rows) == {t: ciks[t] for t in ("T1", "T2", "T4", "T6")}
+
+
+def test_get_zip_members(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, engine: Engine
+) -> None:
+    ciks = {
+        "GOOG": "0001652044",
+        "GOOGL": "0001652044",
+        "BRK-A": "0001067983",
+        "BRK-B": "0001067983",
+        "FOX": "0001754301",
+        "FOXA": "0001754301",
+        "AAPL": "0000320193",
+    }
+    primary = {"0001652044": "GOOGL", "0001067983": "BRK-B", "0001754301": "FOX"}
+    with zipfile.ZipFile(tmp_path / "companyfacts.zip", "w") as zf:
+        for cik in set(ciks.values()):
+            zf.writestr(f"CIK{cik}.json", "{}")
+        monkeypatch.setattr(finagg.sec.api, "get_cik", ciks.__getitem__)
+        monkeypatch.setattr(finagg.sec.api, "get_ticker", primary.__getitem__)
+        with engine.begin() as conn:
+            conn.execute(
+                finagg.sec.sql.submissions.insert(),
+                [{"cik": "0001754301", "ticker": "FOXA", "sic": "1000"}],
+            )
+        # Tickers that share a CIK are resolved to one ticker, preferring the
+        # submissions table, then the primary ticker, and then the first
+        # ticker alphabetically.
+        assert finagg.sec.feat._raw._get_zip_members(zf, set(ciks), engine=engine) == {
+            "CIK0001652044.json": "GOOGL",
+            "CIK0001067983.json": "BRK-B",
+            "CIK0001754301.json": "FOXA",
+            "CIK0000320193.json": "AAPL",
+        }
+        monkeypatch.setattr(finagg.sec.api, "get_ticker", {}.get)
+        assert finagg.sec.feat._raw._get_zip_members(
+            zf, {"BRK-B", "BRK-A"}, engine=engine
+        ) == {"CIK0001067983.json": "BRK-A"}
+
+
+def test_tags_get_last_filed(engine: Engine) -> None:
+    assert finagg.sec.feat.tags.get_last_filed(engine=engine) == {}
+    df = pd.DataFrame(
+        {
+            "cik": "0000000001",
+            "tag": ["A", "A", "B"],
+            "form": "10-Q",
+            "units": "USD",
+            "fy": [2020, 2020, 2020],
+            "fp": ["Q1", "Q2", "Q1"],
+            "filed": ["2020-05-01", "2020-08-01", "2020-05-02"],
+            "val": [1.0, 2.0, 3.0],
+        }
+    )
+    finagg.sec.feat.tags.to_raw(df, engine=engine)
+    last_filed = finagg.sec.feat.tags.get_last_filed(engine=engine)
+    assert last_filed == {"0000000001": {"A": "2020-08-01", "B": "2020-05-02"}}
+
+    df = pd.DataFrame(
+        {
+            "tag": ["A", "A", "B", "C"],
+            "filed": ["2020-08-01", "2020-11-01", "2020-05-01", "2020-05-01"],
+        }
+    )
+    df_new = finagg.sec.feat._raw._filter_new_filings(df, last_filed["0000000001"])
+    assert df_new.index.tolist() == [1, 3]
+
+
+def test_tags_install_incremental(
+    monkeypatch: pytest.MonkeyPatch, engine: Engine
+) -> None:
+    ciks = {"T01": "0000000001", "T02": "0000000002"}
+    years = {"T01": range(2010, 2015), "T02": range(2010, 2015)}
+
+    def get_concept(tag: str, /, *, ticker: str, **kwargs: Any) -> pd.DataFrame:
+        calls.append(ticker)
+        j = [concept["tag"] for concept in finagg.sec.api.popular_concepts].index(tag)
+        df = pd.DataFrame(make_facts(years[ticker], scale=(j + 1) * int(ciks[ticker])))
+        df["cik"] = ciks[ticker]
+        df["tag"] = tag
+        df["units"] = kwargs["units"]
+        return df
+
+    def get_submissions(*, ticker: str) -> dict[str, pd.DataFrame]:
+        fy = years[ticker][-1]
+        return {
+            "filings": pd.DataFrame(
+                {"form": ["10-Q", "10-K"], "filingDate": [f"{fy}-08-15", f"{fy}-11-15"]}
+            )
+        }
+
+    def count_rows(table: sa.Table, ticker: str) -> int:
+        with engine.begin() as conn:
+            return int(
+                conn.execute(
+                    sa.select(sa.func.count())
+                    .select_from(table)
+                    .where(table.c.cik == ciks[ticker])
+                ).scalar_one()
+            )
+
+    def spy_install(
+        feature: type[finagg.sec.feat.Annual] | type[finagg.sec.feat.Quarterly],
+    ) -> Callable[..., int]:
+        install = feature.install
+
+        def spy(tickers: set[str], /, **kwargs: Any) -> int:
+            installed.append((feature.__name__, set(tickers)))
+            return install(tickers, **kwargs)
+
+        return spy
+
+    calls: list[str] = []
+    installed: list[tuple[str, set[str]]] = []
+    monkeypatch.setattr(finagg.sec.api, "get_cik", ciks.__getitem__)
+    for feature in (finagg.sec.feat.Annual, finagg.sec.feat.Quarterly):
+        monkeypatch.setattr(feature, "install", spy_install(feature))
+    monkeypatch.setattr(finagg.sec.api.company_concept, "get", get_concept)
+    monkeypatch.setattr(finagg.sec.api.submissions, "get", get_submissions)
+    with engine.begin() as conn:
+        conn.execute(
+            finagg.sec.sql.submissions.insert(),
+            [{"cik": cik, "ticker": t, "sic": "1000"} for t, cik in ciks.items()],
+        )
+    refined: set[Literal["annual", "quarterly"]] = {"annual", "quarterly"}
+    finagg.sec.feat.tags.install(set(ciks), processes=1, refined=refined, engine=engine)
+    tables = (finagg.sec.sql.tags, finagg.sec.sql.annual, finagg.sec.sql.quarterly)
+    counts = {t: [count_rows(table, t) for table in tables] for t in ciks}
+    assert all(counts["T01"])
+    assert installed == [("Annual", set(ciks)), ("Quarterly", set(ciks))]
+    # Refined features of companies without new filings aren't recomputed.
+    with engine.begin() as conn:
+        conn.execute(finagg.sec.sql.annual.delete())
+        conn.execute(finagg.sec.sql.quarterly.delete())
+
+    calls.clear()
+    installed.clear()
+    years["T01"] = range(2010, 2016)
+    total_rows = finagg.sec.feat.tags.install(
+        set(ciks), processes=1, incremental=True, refined=refined, engine=engine
+    )
+    assert set(calls) == {"T01"}
+    assert installed == [("Annual", {"T01"}), ("Quarterly", {"T01"})]
+    n_concepts = len(finagg.sec.api.popular_concepts)
+    assert count_rows(finagg.sec.sql.tags, "T01") == counts["T01"][0] + 4 * n_concepts
+    assert count_rows(finagg.sec.sql.tags, "T02") == counts["T02"][0]
+    assert count_rows(finagg.sec.sql.annual, "T01") == counts["T01"][1] + 1
+    assert count_rows(finagg.sec.sql.quarterly, "T01") == counts["T01"][2] + 3
+    assert count_rows(finagg.sec.sql.annual, "T02") == 0
+    assert count_rows(finagg.sec.sql.quarterly, "T02") == 0
+    assert total_rows == 4 * n_concepts + sum(
+        count_rows(table, "T01") for table in tables[1:]
+    )
+
+    # Nothing is installed or recomputed once there are no new filings.
+    calls.clear()
+    installed.clear()
+    assert (
+        finagg.sec.feat.tags.install(
+            set(ciks), processes=1, incremental=True, refined=refined, engine=engine
+        )
+        == 0
+    )
+    assert not calls
+    assert not installed
+
+
+@pytest.mark.parametrize("zip_stream", [False, True])
+def test_tags_install_from_zip(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+    engine: Engine,
+    zip_stream: bool,
+) -> None:
+    concepts = finagg.sec.api.popular_concepts[:3]
+    years = {f"{i:010d}": range(2000, 2000 + i) for i in range(1, 21)}
+    (tmp_path / "findata").mkdir()
+    with zipfile.ZipFile(tmp_path / "findata" / "companyfacts.zip", "w") as zf:
+        for cik, fys in years.items():
+            zf.writestr(
+                f"CIK{cik}.json",
+                make_company_facts(cik, concepts, fys),
+                zipfile.ZIP_DEFLATED,
+            )
+    with engine.begin() as conn:
+        conn.execute(
+            finagg.sec.sql.submissions.insert(),
+            [{"cik": cik, "ticker": f"T{cik[-2:]}", "sic": "1000"} for cik in years],
+        )
+    monkeypatch.setattr(finagg.config, "root_path", tmp_path)
+    monkeypatch.setattr(finagg.config, "zip_stream", zip_stream)
+    written = []
+    to_raw = finagg.sec.feat.tags.to_raw
+
+    def spy(df: pd.DataFrame, /, **kwargs: Any) -> int:
+        written.append(df["cik"].iloc[0])
+        return to_raw(df, **kwargs)
+
+    monkeypatch.setattr(finagg.sec.feat.Tags, "to_raw", spy)
+    # The largest company isn't installed, and the remaining 19 companies are
+    # processed by a single background process.
+    tickers = {f"T{cik[-2:]}" for cik in years if cik != "0000000020"}
+    total_rows = finagg.sec.feat.tags.install_from_zip(
+        tickers, processes=1, engine=engine
+    )
+    expected_rows = {cik: 4 * len(fys) * len(concepts) for cik, fys in years.items()}
+    del expected_rows["0000000020"]
+    assert total_rows == sum(expected_rows.values())
+    # Companies are processed (and written) from largest to smallest.
+    assert written == sorted(expected_rows, reverse=True)
+    with engine.begin() as conn:
+        rows = conn.execute(
+            sa.select(finagg.sec.sql.tags.c.cik, sa.func.count()).group_by(
+                finagg.sec.sql.tags.c.cik
+            )
+        ).all()
+    assert dict(rows) == expected_rows
+
+
+def test_is_refined_candidate() -> None:
+    tags = [concept["tag"] for concept in finagg.sec.api.popular_concepts]
+    df = pd.DataFrame({"tag": tags, "form": "10-K"})
+    assert finagg.sec.feat._raw._is_refined_candidate(df, "10-K")
+    assert not finagg.sec.feat._raw._is_refined_candidate(df, "10-Q")
+    # Companies without filings for all popular concepts aren't candidates.
+    assert not finagg.sec.feat._raw._is_refined_candidate(df.iloc[1:], "10-K")
+
+
+def test_tags_install_from_zip_requires_submissions(engine: Engine) -> None:
+    with pytest.raises(ValueError, match="requires installing raw submissions"):
+        finagg.sec.feat.tags.install_from_zip(
+            {"AAPL"}, refined={"annual"}, engine=engine
+        )
+
+
+def test_tags_install_refined_from_zip(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, engine: Engine
+) -> None:
+    concepts = finagg.sec.api.popular_concepts
+    ciks = {f"T{i:02d}": f"{i:010d}" for i in range(1, 4)}
+    (tmp_path / "findata").mkdir()
+    with zipfile.ZipFile(tmp_path / "findata" / "companyfacts.zip", "w") as zf:
+        for ticker, cik in ciks.items():
+            # The last company is missing a popular concept, so it isn't a
+            # candidate for refined features.
+            zf.writestr(
+                f"CIK{cik}.json",
+                make_company_facts(
+                    cik,
+                    concepts[:-1] if ticker == "T03" else concepts,
+                    range(2010, 2016),
+                ),
+            )
+    monkeypatch.setattr(finagg.config, "root_path", tmp_path)
+    refined: set[Literal["annual", "quarterly"]] = {"annual", "quarterly"}
+    with pytest.raises(ValueError, match="requires installing raw submissions"):
+        finagg.sec.feat.tags.install_from_zip(
+            set(ciks), processes=1, raw=False, refined=refined, engine=engine
+        )
+
+    with engine.begin() as conn:
+        conn.execute(
+            finagg.sec.sql.submissions.insert(),
+            [{"cik": cik, "ticker": t, "sic": "1000"} for t, cik in ciks.items()],
+        )
+    assert finagg.sec.feat.tags.install_from_zip(
+        set(ciks), processes=1, raw=False, refined=refined, engine=engine
+    )
+    assert not finagg.sec.feat.tags.get_ticker_set(engine=engine)
+    assert finagg.sec.feat.annual.get_ticker_set(engine=engine) == {"T01", "T02"}
+    assert finagg.sec.feat.quarterly.get_ticker_set(engine=engine) == {"T01", "T02"}
+
+    # Features computed from the zip match features computed from the raw
+    # tags SQL table for the same facts.
+    finagg.sec.feat.tags.install_from_zip(set(ciks), processes=1, engine=engine)
+    for ticker in ("T01", "T02"):
+        for feature in (finagg.sec.feat.annual, finagg.sec.feat.quarterly):
+            df1 = feature.from_raw(ticker, engine=engine)
+            df2 = feature.from_refined(ticker, engine=engine)
+            assert len(df1.index)
+            pd.testing.assert_frame_equal(df1, df2, rtol=1e-4)
+
+
+def test_get_zip_chunks(tmp_path: pathlib.Path) -> None:
+    sizes = {"big": 10_000, "medium": 5_000, **{f"small{i}": 100 for i in range(40)}}
+    with zipfile.ZipFile(tmp_path / "companyfacts.zip", "w") as zf:
+        for name, size in sizes.items():
+            zf.writestr(name, "0" * size, zipfile.ZIP_STORED)
+        chunks = finagg.sec.feat._raw._get_zip_chunks(zf, sizes, processes=1)
+    # Large files get their own chunks so they're spread across processes,
+    # while small files are grouped together (up to 32 files per chunk).
+    assert chunks[0] == ["big"]
+    assert chunks[1] == ["medium"]
+    assert all(len(chunk) <= 32 for chunk in chunks)
+    assert max(len(chunk) for chunk in chunks) > 1
+    assert [f for chunk in chunks for f in chunk] == list(sizes)
+
+
+@pytest.mark.parametrize("zip_mmap", [False, True])
+def test_zip_install_worker(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, zip_mmap: bool
+) -> None:
+    path = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("CIK0000000001.json", '{"a": 1}' * 1000, zipfile.ZIP_DEFLATED)
+        zf.writestr("CIK0000000002.json", '{"b": 2}', zipfile.ZIP_STORED)
+    monkeypatch.setattr(finagg.config, "zip_mmap", zip_mmap)
+    monkeypatch.setattr(finagg.sec.feat._raw._ZipInstallWorker, "zipfile", None)
+    monkeypatch.setattr(finagg.sec.feat._raw._ZipInstallWorker, "buffer", None)
+    finagg.sec.feat._raw._ZipInstallWorker.init(str(path))
+    zf = finagg.sec.feat._raw._ZipInstallWorker.zipfile
+    assert zf is not None
+    assert (finagg.sec.feat._raw._ZipInstallWorker.buffer is not None) == zip_mmap
+    assert zf.read("CIK0000000001.json") == b'{"a": 1}' * 1000
+    with zf.open("CIK0000000002.json") as f:
+        assert f.read() == b'{"b": 2}'
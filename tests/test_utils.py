@@ -1,10 +1,211 @@
+import pathlib
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+
 import pandas as pd
 import pytest
+import requests
 import sqlalchemy as sa
+from requests.adapters import BaseAdapter
+from requests_cache.backends import SQLitePickleDict
+from sqlalchemy.dialects import mysql
 
 import finagg
 
 
+def test_bulk_install(tmp_path: pathlib.Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'test.sqlite'}")
+    table = sa.Table(
+        "test",
+        sa.MetaData(),
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+        sa.Index("ix_test_b", "b"),
+    )
+    table.create(engine)
+
+    def get_state(engine: sa.Engine) -> tuple[str, int, list[str]]:
+        with engine.connect() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+        indexes = [index["name"] for index in sa.inspect(engine).get_indexes("test")]
+        return str(journal_mode), int(synchronous), indexes
+
+    assert get_state(engine) == ("delete", 2, ["ix_test_b"])
+    with finagg.utils.bulk_install(engine, tables=[table]) as bulk_engine:
+        assert get_state(bulk_engine) == ("wal", 1, [])
+        table.drop(bulk_engine)
+        table.create(bulk_engine)
+        assert get_state(bulk_engine) == ("wal", 1, [])
+        assert finagg.utils.create_indexes([table], engine=bulk_engine) == 0
+        assert get_state(bulk_engine) == ("wal", 1, [])
+        assert (
+            finagg.utils.create_indexes([table], deferred=True, engine=bulk_engine) == 1
+        )
+        assert get_state(bulk_engine) == ("wal", 1, ["ix_test_b"])
+    assert get_state(engine) == ("delete", 2, ["ix_test_b"])
+    assert finagg.utils.create_indexes([table], engine=engine) == 0
+
+
+def test_bulk_install_nested(tmp_path: pathlib.Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'test.sqlite'}")
+    metadata = sa.MetaData()
+    outer = sa.Table(
+        "outer",
+        metadata,
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+        sa.Index("ix_outer_b", "b"),
+    )
+    inner = sa.Table(
+        "inner",
+        metadata,
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+        sa.Index("ix_inner_b", "b"),
+    )
+    metadata.create_all(engine)
+
+    def get_state(engine: sa.Engine) -> tuple[str, list[str]]:
+        with engine.connect() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        inspector = sa.inspect(engine)
+        indexes = [
+            index["name"]
+            for table in ("inner", "outer")
+            for index in inspector.get_indexes(table)
+        ]
+        return str(journal_mode), indexes
+
+    with finagg.utils.bulk_install(engine, tables=[outer]):
+        with finagg.utils.bulk_install(engine, tables=[outer, inner]):
+            assert get_state(engine) == ("wal", [])
+        assert get_state(engine) == ("wal", ["ix_inner_b"])
+        outer.drop(engine)
+        outer.create(engine)
+        assert get_state(engine) == ("wal", ["ix_inner_b"])
+    assert get_state(engine) == ("delete", ["ix_inner_b", "ix_outer_b"])
+
+
+@pytest.mark.parametrize("batch_size", [None, 7])
+def test_bulk_insert(batch_size: None | int) -> None:
+    engine = sa.create_engine("sqlite://")
+    table = sa.Table(
+        "test",
+        sa.MetaData(),
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.Float),
+        sa.Column("c", sa.String),
+    )
+    table.create(engine)
+    n = 25_000
+    df = pd.DataFrame(
+        {
+            "a": range(n),
+            "b": [None if i % 3 == 0 else i / 2 for i in range(n)],
+            "c": pd.Categorical(["x", None, ""] * (n // 3) + ["x"] * (n % 3)),
+            "d": 0,
+        }
+    )
+    assert (
+        finagg.utils.bulk_insert(table, df, engine=engine, batch_size=batch_size) == n
+    )
+    with engine.begin() as conn:
+        rows = conn.execute(table.select().order_by(table.c.a)).all()
+    assert len(rows) == n
+    assert tuple(rows[0]) == (0, None, "x")
+    assert tuple(rows[1]) == (1, 0.5, None)
+    assert tuple(rows[2]) == (2, 1.0, "")
+    with pytest.raises(sa.exc.IntegrityError):
+        finagg.utils.bulk_insert(table, df.head(1), engine=engine)
+
+    df = pd.DataFrame({"a": [0, n], "b": [1.5, 2.5], "c": ["y", "z"]})
+    assert finagg.utils.bulk_insert(table, df, engine=engine, upsert=True) == 2
+    with engine.begin() as conn:
+        rows = conn.execute(table.select().where(table.c.a.in_([0, n]))).all()
+    assert sorted(tuple(row) for row in rows) == [(0, 1.5, "y"), (n, 2.5, "z")]
+
+
+def test_bulk_insert_upsert_fallbacks() -> None:
+    table = sa.Table(
+        "test",
+        sa.MetaData(),
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+    )
+    # SQLite upserts are usually written with multi-row inserts, so this
+    # exercises deleting conflicting rows before inserting them.
+    engine = sa.create_engine("sqlite://")
+    table.create(engine)
+    with engine.begin() as conn:
+        finagg.utils._insert_many(conn, table, ["a", "b"], [(0, "x"), (1, "y")])
+        finagg.utils._insert_many(
+            conn, table, ["a", "b"], [(1, "z"), (2, "w")], upsert=True
+        )
+        rows = conn.execute(table.select().order_by(table.c.a)).all()
+    assert [tuple(row) for row in rows] == [(0, "x"), (1, "z"), (2, "w")]
+
+    class MySQLConnection:
+        dialect = mysql.dialect()
+
+        def __init__(self) -> None:
+            self.statements: list[str] = []
+
+        def execute(self, statement: sa.ClauseElement, _: Any = None) -> None:
+            self.statements.append(str(statement.compile(dialect=self.dialect)))
+
+    mysql_conn = MySQLConnection()
+    finagg.utils._insert_many(mysql_conn, table, ["a", "b"], [(1, "z")], upsert=True)
+    assert mysql_conn.statements[0].endswith("ON DUPLICATE KEY UPDATE b = VALUES(b)")
+
+
+def test_to_copy_csv() -> None:
+    rows = [(1, 0.5, None), (2, None, ""), (3, -1.0, 'a "b",\\N'), (4, True, "\\N")]
+    buffer = finagg.utils._to_copy_csv(rows)
+    # Only nulls are written as the unquoted null marker, so empty strings
+    # and strings that look like the marker aren't read as nulls.
+    assert buffer.read().splitlines() == [
+        "1,0.5,\\N",
+        '2,\\N,""',
+        '3,-1.0,"a ""b"",\\N"',
+        '4,True,"\\N"',
+    ]
+
+
+def test_to_copy_csv_integer_columns() -> None:
+    # Integer columns with nulls are held as floats in dataframes.
+    rows = [(2020.0, 2020.0, "Assets"), (None, 1.5, "Assets"), (1.5, 1.5, "")]
+    buffer = finagg.utils._to_copy_csv(
+        rows, types=[sa.Integer(), sa.Float(), sa.String()]
+    )
+    assert buffer.read().splitlines() == [
+        '2020,2020.0,"Assets"',
+        '\\N,1.5,"Assets"',
+        '1.5,1.5,""',
+    ]
+
+
+def test_create_indexes() -> None:
+    engine = sa.create_engine("sqlite://")
+    sa.Table(
+        "test",
+        sa.MetaData(),
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+    ).create(engine)
+    table = sa.Table(
+        "test",
+        sa.MetaData(),
+        sa.Column("a", sa.Integer, primary_key=True),
+        sa.Column("b", sa.String),
+        sa.Index("ix_test_b", "b"),
+    )
+    missing = sa.Table("missing", sa.MetaData(), sa.Column("a", sa.Integer, index=True))
+    assert finagg.utils.create_indexes([table, missing], engine=engine) == 1
+    assert [i["name"] for i in sa.inspect(engine).get_indexes("test")] == ["ix_test_b"]
+    assert finagg.utils.create_indexes([table, missing], engine=engine) == 0
+
+
 def test_get_func_cols_from_table() -> None:
     table = sa.Table(
         "test",
@@ -22,6 +223,81 @@ def test_get_func_cols_from_df() -> None:
     assert tuple(finagg.utils.get_func_cols(df)) == ("LOWER(b)", "UPPER(d)")
 
 
+def test_expiration_rules() -> None:
+    expire_at = (datetime.now(timezone.utc) - timedelta(minutes=1)).time()
+    rules = finagg.utils.ExpirationRules(
+        {
+            "example.com/daily": expire_at.replace(tzinfo=timezone.utc),
+            "example.com": timedelta(days=1),
+        }
+    )
+    expires = rules["example.com/daily"]
+    assert isinstance(expires, datetime)
+    assert timedelta(0) < expires - datetime.now(timezone.utc) <= timedelta(days=1)
+    assert rules["example.com"] == timedelta(days=1)
+    assert list(rules) == ["example.com/daily", "example.com"]
+
+
+def test_make_session_revalidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(finagg.config, "http_cache_backend", "memory")
+    monkeypatch.setattr(finagg.config, "disable_http_cache", False)
+    requests_sent = []
+
+    class Adapter(BaseAdapter):
+        def send(
+            self, request: requests.PreparedRequest, **_: object
+        ) -> requests.Response:
+            requests_sent.append(request)
+            response = requests.Response()
+            response.request = request
+            response.url = str(request.url)
+            if "If-None-Match" in request.headers:
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response.headers["ETag"] = "v1"
+                response._content = b"body"
+            return response
+
+        def close(self) -> None:
+            ...
+
+    session = finagg.utils.make_session(expire_after=timedelta(seconds=-1))
+    session.mount("https://example.com", Adapter())
+    first = session.get("https://example.com/data")
+    second = session.get("https://example.com/data")
+    assert requests_sent[1].headers["If-None-Match"] == "v1"
+    assert not getattr(first, "revalidated", False)
+    assert second.revalidated
+    assert second.content == b"body"
+    limit = finagg.ratelimit.RequestLimit(1, 1)
+    assert limit.eval(second) == 1
+    assert finagg.ratelimit.SizeLimit(1, 1).eval(second) == 0
+
+
+def test_lru_storage(tmp_path: pathlib.Path) -> None:
+    storage = SQLitePickleDict(tmp_path / "http_cache", table_name="responses")
+    for key in ("a", "b"):
+        response = requests.Response()
+        response._content = b"x" * 4
+        storage[key] = response
+    lru = finagg.utils.LRUStorage(storage, max_size=1_000_000)
+    assert set(lru._index) == {"a", "b"}
+    lru.max_size = lru.size
+    lru["a"]
+    response = requests.Response()
+    response._content = b"x" * 4
+    lru["c"] = response
+    assert set(storage) == {"a", "c"}
+    # New responses are measured the same way as responses already stored.
+    sizes = dict(finagg.utils._iter_sizes(storage))
+    assert lru._index == sizes
+    assert lru.size == sum(sizes.values())
+    lru.bulk_delete(["a"])
+    assert set(storage) == {"c"}
+    assert lru.size == sizes["c"]
+
+
 @pytest.mark.parametrize(
     "s,expected",
     [